@@ -0,0 +1,84 @@
+# Compare the foreach_get based Z extrema against the old per-vertex loops.
+#
+#   blender --background --factory-startup --python benchmarks/bench_extrema.py -- --verts 100000 1000000
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpy, bmesh
+import ec3d_bases
+
+def loopBottomZ(obj):
+    bottom_z = 10000
+    for v in obj.data.vertices:
+        z = (obj.matrix_world @ v.co)[2]
+        if z < bottom_z:
+            bottom_z = z
+    return bottom_z
+
+def loopTopZ(obj):
+    top_z = -10000
+    for v in obj.data.vertices:
+        z = v.co[2]
+        if z > top_z:
+            top_z = z
+    return top_z
+
+def topZ(obj):
+    return ec3d_bases.zExtrema(obj, world=False)[1]
+
+def loopBottomVerts(obj, bottom_z):
+    return [v.index for v in obj.data.vertices if v.co[2] == bottom_z]
+
+def makeGrid(verts):
+    # subdivided grid with a little relief, roughly `verts` vertices
+    side = max(2, int(verts ** 0.5))
+    mesh = bpy.data.meshes.new("_bench_grid")
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=side - 1, y_segments=side - 1, size=25)
+    for i, v in enumerate(bm.verts):
+        v.co.z = ((i * 7919) % 1000) / 1000.0
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new("_bench_grid", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.location = (1.0, 2.0, 3.0)
+    bpy.context.view_layer.update()
+    return obj
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verts", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print("%10s %12s %12s %12s %12s %8s" % ("verts", "loop bottom", "loop top", "np bottom", "np top", "speedup"))
+    for verts in args.verts:
+        obj = makeGrid(verts)
+        assert abs(loopBottomZ(obj) - ec3d_bases.bottomZ(obj)) < 1e-5
+        assert abs(loopTopZ(obj) - topZ(obj)) < 1e-5
+
+        old_bottom = timed(lambda: loopBottomVerts(obj, loopBottomZ(obj)), repeat=args.repeat)
+        old_top = timed(loopTopZ, obj, repeat=args.repeat)
+        new_bottom = timed(ec3d_bases.zExtrema, obj, repeat=args.repeat)
+        new_top = timed(topZ, obj, repeat=args.repeat)
+        print("%10d %11.4fs %11.4fs %11.4fs %11.4fs %7.1fx" % (
+            len(obj.data.vertices), old_bottom, old_top, new_bottom, new_top,
+            (old_bottom + old_top) / (new_bottom + new_top)))
+
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+if __name__ == "__main__":
+    main()
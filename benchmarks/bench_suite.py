@@ -0,0 +1,235 @@
+# Time the base pipelines on deterministic synthetic minis, and compare against a stored baseline.
+#
+#   blender --background --factory-startup --python benchmarks/bench_suite.py -- \
+#       --verts 10000 100000 --repeat 5 --output bench.json --baseline benchmarks/baseline.json
+#
+# Fixtures are a round, square or hex base (25, 50 or 100mm across) with a lumpy figure standing on it, voxel
+# remeshed to roughly --verts verts so the density is even like a sculpt. The bottom gets a little Z jitter for
+# fix bottom to clean up. Fixtures only depend on their parameters and --seed, and each result records a hash
+# of its fixture so results from different fixtures are never compared.
+#
+# Every timed run works on a fresh copy of the fixture. The output JSON has the times, median and p95 for each
+# fixture + pipeline. With --baseline, medians more than --threshold slower than the baseline are reported as
+# regressions and the exit code is 1.
+import os, sys, json, time, shutil, hashlib, platform, argparse, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpy, bmesh
+import numpy as np
+import ec3d_bases
+
+SHAPES = {"round": 64, "hex": 6, "square": 4}
+SIZES = (25, 50, 100)
+PIPELINES = ("fix_bottom", "bevel_simple", "bevel_fancy_small", "bevel_fancy_large", "trim_bottom_small", "export")
+
+BASE_HEIGHT = 3
+# verts per unit of surface area for a voxel size of 1, measured from the remesh modifier
+VOXEL_DENSITY = 1.1
+BOTTOM_JITTER = .03
+# differences smaller than this are noise whatever the ratio
+REGRESSION_FLOOR = .005
+
+def makeFixture(shape, size, verts, seed=0):
+    radius = size / 2
+    bm = bmesh.new()
+    bmesh.ops.create_cone(bm, cap_ends=True, cap_tris=False, segments=SHAPES[shape], radius1=radius, radius2=radius,
+                          depth=BASE_HEIGHT)
+    # the figure is a stretched sphere sunk into the top of the base, the remesh joins the two
+    figure = bmesh.ops.create_uvsphere(bm, u_segments=32, v_segments=16, radius=radius * .4)["verts"]
+    bmesh.ops.scale(bm, vec=(1.0, .8, 2.0), verts=figure)
+    bmesh.ops.translate(bm, vec=(0.0, 0.0, BASE_HEIGHT / 2 + radius * .7), verts=figure)
+    area = sum(f.calc_area() for f in bm.faces)
+
+    name = "_bench_%s_%d_%d" % (shape, size, verts)
+    obj = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+    bm.to_mesh(obj.data)
+    bm.free()
+    bpy.context.scene.collection.objects.link(obj)
+
+    remesh = obj.modifiers.new(type="REMESH", name="_bench_remesh")
+    remesh.mode = 'VOXEL'
+    remesh.voxel_size = (VOXEL_DENSITY * area / verts) ** .5
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    old_mesh = obj.data
+    obj.modifiers.remove(remesh)
+    obj.data = mesh
+    bpy.data.meshes.remove(old_mesh)
+    mesh.name = name
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords = coords.reshape(-1, 3)
+    rng = np.random.default_rng(seed)
+
+    # sculpt-ish lumps on the figure, pushed out sideways so they never fold through the surface
+    figure = coords[:, 2] > BASE_HEIGHT / 2 + .5
+    x, y, z = coords[figure].T
+    lumps = (np.sin(x * 1.7 + z * .9) + np.sin(y * 2.3 - z * 1.3) + np.sin(z * 3.1)) * radius * .01
+    length = np.maximum(np.hypot(x, y), 1e-6)
+    coords[figure, 0] += x / length * lumps
+    coords[figure, 1] += y / length * lumps
+
+    # a slightly uneven bottom, like a sculpt that was never flattened
+    bottom = coords[:, 2] < coords[:, 2].min() + 1e-4
+    coords[bottom, 2] += rng.uniform(0, BOTTOM_JITTER, np.count_nonzero(bottom)).astype(np.float32)
+
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
+    bpy.context.view_layer.update()
+    return obj
+
+def fixtureHash(obj):
+    coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", coords)
+    return hashlib.blake2b(coords.tobytes(), digest_size=8).hexdigest()
+
+def copyFixture(context, fixture):
+    obj = fixture.copy()
+    obj.data = fixture.data.copy()
+    context.scene.collection.objects.link(obj)
+    ec3d_bases.selectOnly(context, obj)
+    return obj
+
+def removeObjects(objects):
+    meshes = [obj.data for obj in objects]
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+    for mesh in meshes:
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+
+def timedRun(context, fixture, pipeline, export_dir):
+    obj = copyFixture(context, fixture)
+    existing = set(bpy.data.objects)
+    existing.discard(obj)
+
+    start = time.perf_counter()
+    if pipeline == "export":
+        ec3d_bases.exportObjects(context, [obj], export_dir)
+    else:
+        ec3d_bases.PIPELINES[pipeline][1](context, obj)
+    elapsed = time.perf_counter() - start
+
+    # the bevels leave a duplicate next to the copy, clear everything the run made
+    if obj.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    removeObjects([o for o in bpy.data.objects if o not in existing])
+    return elapsed
+
+def summarize(times):
+    return {
+        "times": times,
+        "min": min(times),
+        "median": float(np.median(times)),
+        "p95": float(np.percentile(times, 95)),
+    }
+
+def compare(results, baseline, threshold):
+    # returns (comparison rows, regressions), rows for fixtures missing from the baseline are skipped
+    base = {(r["fixture"], r["pipeline"]): r for r in baseline["results"]}
+    rows = []
+    regressions = []
+    for result in results:
+        old = base.get((result["fixture"], result["pipeline"]))
+        if old is None:
+            continue
+        row = {"fixture": result["fixture"], "pipeline": result["pipeline"],
+               "baseline_median": old["median"], "median": result["median"]}
+        if old.get("fixture_hash") != result["fixture_hash"]:
+            row["status"] = "fixture changed"
+        else:
+            row["ratio"] = result["median"] / old["median"] if old["median"] else None
+            slower = result["median"] - old["median"]
+            if row["ratio"] is not None and row["ratio"] > 1 + threshold and slower > REGRESSION_FLOOR:
+                row["status"] = "regression"
+                regressions.append(row)
+            elif row["ratio"] is not None and row["ratio"] < 1 - threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "same"
+        rows.append(row)
+    return rows, regressions
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", nargs="+", default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--verts", type=int, nargs="+", default=[10000, 100000],
+                        help="fixture sizes, up to 5000000 (slow, the exact booleans dominate)")
+    parser.add_argument("--pipelines", nargs="+", default=list(PIPELINES),
+                        choices=list(ec3d_bases.PIPELINES) + ["export"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast-path", action="store_true")
+    parser.add_argument("--slab", type=float, metavar="HEIGHT")
+    parser.add_argument("--output", help="write the results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=.1, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    ec3d_bases.register()
+    context = bpy.context
+    context.scene.ec3d.use_fast_path = args.fast_path
+    if args.slab:
+        context.scene.ec3d.use_slab = True
+        context.scene.ec3d.slab_height = args.slab
+
+    # the channel cutters are built once and cached, build them up front so the first run isn't charged for it
+    ec3d_bases.channelCutterMesh(context, False, context.scene.ec3d.bevel_depth)
+    ec3d_bases.channelCutterMesh(context, True, context.scene.ec3d.bevel_depth)
+
+    export_dir = tempfile.mkdtemp(prefix="ec3d_bench_")
+    results = []
+    try:
+        for shape in args.shapes:
+            for size in args.sizes:
+                for verts in args.verts:
+                    fixture = makeFixture(shape, size, verts, args.seed)
+                    name = "%s_%dmm_%dk" % (shape, size, verts // 1000)
+                    info = {"fixture": name, "shape": shape, "size": size, "verts": len(fixture.data.vertices),
+                            "faces": len(fixture.data.polygons), "fixture_hash": fixtureHash(fixture)}
+                    for pipeline in args.pipelines:
+                        times = [timedRun(context, fixture, pipeline, export_dir) for _ in range(args.repeat)]
+                        result = dict(info, pipeline=pipeline, **summarize(times))
+                        results.append(result)
+                        print("%-22s %-20s median %8.3fs  p95 %8.3fs" % (
+                            name, pipeline, result["median"], result["p95"]), file=sys.stderr)
+                    removeObjects([fixture])
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+        ec3d_bases.unregister()
+
+    report = {
+        "blender": bpy.app.version_string,
+        "machine": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {"repeat": args.repeat, "seed": args.seed, "fast_path": args.fast_path, "slab": args.slab},
+        "results": results,
+    }
+
+    code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows, regressions = compare(results, json.load(f), args.threshold)
+        report["comparison"] = rows
+        for row in rows:
+            print("%-22s %-20s %8.3fs -> %8.3fs  %s" % (
+                row["fixture"], row["pipeline"], row["baseline_median"], row["median"], row["status"]), file=sys.stderr)
+        if regressions:
+            print("%d regression(s) over %d%%" % (len(regressions), args.threshold * 100), file=sys.stderr)
+            code = 1
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+    else:
+        print(json.dumps(report))
+    return code
+
+if __name__ == "__main__":
+    code = main()
+    sys.stdout.flush()
+    sys.exit(code)
@@ -0,0 +1,68 @@
+# Compare the plane cut trim against the boolean cube trim.
+#
+#   blender --background --factory-startup --python benchmarks/bench_trim.py -- --verts 100000 1000000 5000000
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpy, bmesh
+import ec3d_bases
+
+def makeSphere(verts):
+    # closed uv sphere with roughly `verts` vertices, flattened a little so it has a clear bottom
+    segments = max(8, int(verts ** 0.5))
+    mesh = bpy.data.meshes.new("_bench_sphere")
+    bm = bmesh.new()
+    bmesh.ops.create_uvsphere(bm, u_segments=segments, v_segments=segments, radius=12.5)
+    bmesh.ops.scale(bm, vec=(1.0, 1.0, 0.6), verts=bm.verts)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new("_bench_sphere", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.location = (1.0, 2.0, 3.0)
+    bpy.context.view_layer.update()
+    return obj
+
+def volume(obj):
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    vol = bm.calc_volume()
+    bm.free()
+    return vol
+
+def timedTrim(context, verts, mode, remove):
+    obj = makeSphere(verts)
+    ec3d_bases.selectOnly(context, obj)
+    context.scene.ec3d.trim_mode = mode
+    start = time.perf_counter()
+    ec3d_bases.trimBottom(context, obj, remove)
+    elapsed = time.perf_counter() - start
+
+    count = len(obj.data.vertices)
+    vol = volume(obj)
+    mesh = obj.data
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    return elapsed, count, vol
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verts", type=int, nargs="+", default=[100000, 1000000, 5000000])
+    parser.add_argument("--remove", type=float, default=.1)
+    args = parser.parse_args(argv)
+
+    ec3d_bases.register()
+    context = bpy.context
+
+    print("%10s %12s %12s %8s %10s" % ("verts", "boolean", "plane", "speedup", "vol diff"))
+    for verts in args.verts:
+        bool_time, count, bool_vol = timedTrim(context, verts, 'BOOLEAN', args.remove)
+        plane_time, _, plane_vol = timedTrim(context, verts, 'PLANE', args.remove)
+        print("%10d %11.3fs %11.3fs %7.1fx %9.4f%%" % (
+            count, bool_time, plane_time, bool_time / plane_time, abs(bool_vol - plane_vol) / bool_vol * 100))
+
+    ec3d_bases.unregister()
+
+if __name__ == "__main__":
+    main()
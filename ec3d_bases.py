@@ -6,17 +6,69 @@ bl_info = {
     "category": "Object"
 }
 
-import bpy, bmesh, math, os, mathutils
+import bpy, bmesh, math, os, sys, gc, csv, json, time, zipfile, hashlib, tempfile, threading, functools, contextlib
+import mathutils
+import mathutils.kdtree
+import mathutils.bvhtree
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from bpy_extras.io_utils import ExportHelper
 
+try:
+    import resource
+except ImportError:
+    # not on windows, profiling records no peak memory there
+    resource = None
+
 BOTTOM_TOLERANCE = 0.05
 BOTTOM_MERGE_VERTS_DISTANCE = .01
 
 BASE_BEVEL_DEPTH = .7
 SIMPLE_BEVEL_SHRINK_DISTANCE = .5
+# how far (in shrink distances) a sharp corner of the bottom can be pulled in by the bevel inset
+BEVEL_MITER_LIMIT = 4
 
 BOTTOM_TRIM_VALUE_SHORT = .05
 BOTTOM_TRIM_VALUE_TALL = .1
+TRIM_CUBE_SIZE = 200
+
+# how many meshes to keep analysis for, and how many verts to sample when fingerprinting a mesh
+ANALYSIS_CACHE_SIZE = 32
+ANALYSIS_FINGERPRINT_SAMPLES = 64
+
+# export writes files on background threads, at most EXPORT_MAX_PENDING extracted meshes are held in memory
+EXPORT_THREADS = 4
+EXPORT_MAX_PENDING = 8
+# kept in the export folder so Repeat Export can skip files that haven't changed
+EXPORT_MANIFEST = ".ec3d_export.json"
+# files are written under this suffix and renamed once the whole export is done
+EXPORT_PART_SUFFIX = ".part"
+# deduplicated exports write one file per unique mesh, and how many of each to print in here
+EXPORT_COUNTS = "counts.json"
+
+# previews run on a proxy of just the bottom PREVIEW_BAND_HEIGHT of the model, decimated down to PREVIEW_MAX_FACES
+PREVIEW_BAND_HEIGHT = 3
+PREVIEW_MAX_FACES = 5000
+
+# preflight: flat bottom area share, thinnest wall, and how many faces the wall check samples
+PREFLIGHT_FLAT_SHARE = .99
+PREFLIGHT_MIN_WALL = .6
+PREFLIGHT_WALL_SAMPLES = 2000
+PREFLIGHT_RAY_OFFSET = 1e-4
+PREFLIGHT_CACHE_SIZE = 512
+PREFLIGHT_PANEL_ROWS = 20
+
+# plates are laid out in a row along X with PLATE_GAP between them, the first one centered on the world origin
+PLATE_GAP = 20
+
+# modal operators step their work from a timer, each tick runs steps until MODAL_STEP_SECONDS have gone by
+MODAL_TIMER_INTERVAL = .05
+MODAL_STEP_SECONDS = .1
+
+# profiling keeps the last PROFILE_MAX_RECORDS stage timings, the panel shows the last PROFILE_PANEL_ROWS
+PROFILE_MAX_RECORDS = 1000
+PROFILE_PANEL_ROWS = 12
 
 # ------- UI --------
 class VIEW3D_PT_EC3D_Bases_Tools_Panel(bpy.types.Panel):
@@ -41,13 +93,51 @@ class VIEW3D_PT_EC3D_Bases_Tools_Panel(bpy.types.Panel):
         col1.operator("ec3d_bases.bevel_fancy_small_additive", text="Channeled Bevel (1 inch, Additive)", icon='OUTLINER_OB_MESH')
         col1.operator("ec3d_bases.bevel_fancy_large", text="Channeled Bevel (2+ inch)", icon='OUTLINER_OB_MESH')
         col1.operator("ec3d_bases.bevel_fancy_large_additive", text="Channeled Bevel (2+ inch, Additive)", icon='OUTLINER_OB_MESH')
+        layout.prop(context.scene.ec3d, "use_fast_path")
+        row_slab = layout.row(align=True)
+        row_slab.prop(context.scene.ec3d, "use_slab")
+        if context.scene.ec3d.use_slab:
+            row_slab.prop(context.scene.ec3d, "slab_height", text="")
+        layout.label(text="PREVIEW")
+        col_preview = layout.column(align=True)
+        col_preview.prop(context.scene.ec3d, "bevel_depth")
+        col_preview.prop(context.scene.ec3d, "bevel_shrink")
+        col_preview.prop(context.scene.ec3d, "preview_pipeline", text="")
+        row_preview = col_preview.row(align=True)
+        row_preview.operator("ec3d_bases.preview_bevel", text="Preview", icon='HIDE_OFF')
+        row_preview.operator("ec3d_bases.preview_apply", text="Apply", icon='CHECKMARK')
+        row_preview.operator("ec3d_bases.preview_clear", text="", icon='X')
+        layout.label(text="BATCH")
+        col_batch = layout.column(align=True)
+        col_batch.prop(context.scene.ec3d, "batch_pipeline", text="")
+        col_batch.prop(context.scene.ec3d, "batch_source", text="")
+        if context.scene.ec3d.batch_source == 'COLLECTION':
+            col_batch.prop(context.scene.ec3d, "batch_collection", text="")
+        col_batch.prop(context.scene.ec3d, "use_dedup")
+        col_batch.prop(context.scene.ec3d, "memory_budget")
+        col_batch.operator("ec3d_bases.batch_process", text="Run Batch", icon='MOD_ARRAY')
+        memory, peak = memoryMB(), peakMemoryMB()
+        if peak is not None:
+            col_batch.label(text="Memory %.0f MB, peak %.0f MB" % (memory, peak), icon='MEMORY')
+        layout.label(text="PLATE")
+        col_plate = layout.column(align=True)
+        row_plate_size = col_plate.row(align=True)
+        row_plate_size.prop(context.scene.ec3d, "plate_width", text="W")
+        row_plate_size.prop(context.scene.ec3d, "plate_depth", text="D")
+        col_plate.prop(context.scene.ec3d, "plate_spacing")
+        col_plate.prop(context.scene.ec3d, "plate_rotate")
+        row_plate = col_plate.row(align=True)
+        row_plate.operator("ec3d_bases.pack_plate", text="Pack", icon='SNAP_GRID')
+        row_plate.operator("ec3d_bases.export_plate", text="Export Plate", icon='FILE_NEW')
         layout.label(text="GENERAL")
         col2 = layout.column(align=True)
         #col2.operator("ec3d_bases.fix_bottom", text="Fix bottom", icon='TRIA_DOWN_BAR')
         col2.operator("ec3d_bases.trim_bottom_small", text="Trim bottom (small)", icon='TRIA_DOWN_BAR')
         col2.operator("ec3d_bases.trim_bottom_large", text="Trim bottom (large)", icon='TRIA_DOWN_BAR')
+        col2.prop(context.scene.ec3d, "trim_mode", text="")
         col3 = layout.column(align=True)
-        col3.operator("ec3d_bases.export_to_stl", text="STL Export", icon='FILE_NEW')
+        col3.prop(context.scene.ec3d, "export_format", text="")
+        col3.operator("ec3d_bases.export_to_stl", text="Export", icon='FILE_NEW')
 
         export_folder = context.scene.ec3d.export_path
         if export_folder != "//":
@@ -56,82 +146,524 @@ class VIEW3D_PT_EC3D_Bases_Tools_Panel(bpy.types.Panel):
             shorter = os.sep.join(dirs[-3:])
             layout.label(text="> " + shorter)
 
-            col3.operator("ec3d.export_repeat", text="Repeat Export", icon='RECOVER_LAST')
+            col3.operator("ec3d_bases.export_repeat", text="Repeat Export", icon='RECOVER_LAST')
 
-# ------- HELPER FUNCTIONS -----
-def bottomZ(obj):
-    bottom_z = 10000
-    for v in obj.data.vertices:
-        z = gco(obj, v.co)[2]
-        if z < bottom_z:
-            bottom_z = z
+class VIEW3D_PT_EC3D_Bases_Profile_Panel(bpy.types.Panel):
+    bl_label = "Profiling"
+    bl_category = "Bases"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_parent_id = "VIEW3D_PT_EC3D_Bases_Tools_Panel"
+    bl_options = {'DEFAULT_CLOSED'}
 
-    return bottom_z
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.ec3d, "use_profiling")
+
+        records = _profile_records[-PROFILE_PANEL_ROWS:]
+        if records:
+            col = layout.column(align=True)
+            for record in records:
+                row = col.row(align=True)
+                row.label(text="  " * record["depth"] + record["stage"])
+                row.label(text="..." if record["seconds"] is None else "%.3fs" % record["seconds"])
+                if record["verts_after"] is not None:
+                    row.label(text="%s > %s v" % (record["verts_before"], record["verts_after"]))
+                else:
+                    row.label(text="")
+                if record["peak_mb"] is not None:
+                    row.label(text="%.0f MB" % record["peak_mb"])
+        else:
+            layout.label(text="Nothing recorded yet")
 
-def topZ(obj):
-    top_z = -10000
-    for v in obj.data.vertices:
-        z = v.co[2]
-        if z > top_z:
-            top_z = z
+        row = layout.row(align=True)
+        row.operator("ec3d_bases.profile_dump", text="Save JSON/CSV", icon='FILE_TEXT')
+        row.operator("ec3d_bases.profile_clear", text="", icon='X')
 
-    return top_z
+class VIEW3D_PT_EC3D_Bases_Preflight_Panel(bpy.types.Panel):
+    bl_label = "Preflight"
+    bl_category = "Bases"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_parent_id = "VIEW3D_PT_EC3D_Bases_Tools_Panel"
+    bl_options = {'DEFAULT_CLOSED'}
 
-# get global coordss
-def gco(obj, co):
-    return obj.matrix_world @ co
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.ec3d, "use_preflight")
+        layout.operator("ec3d_bases.preflight", text="Check Selected", icon='CHECKMARK')
+
+        if not _preflight_results:
+            layout.label(text="Nothing checked yet")
+            return
+        # problems first
+        rows = sorted(_preflight_results, key=lambda item: not item[1].problems())[:PREFLIGHT_PANEL_ROWS]
+        col = layout.column(align=True)
+        row = col.row(align=True)
+        for heading in ("Object", "Open", "Non-man.", "Flat", "Thin"):
+            row.label(text=heading)
+        for name, result in rows:
+            row = col.row(align=True)
+            row.label(text=name, icon='ERROR' if result.problems() else 'CHECKMARK')
+            row.label(text=str(result.boundary_edges))
+            row.label(text=str(result.nonmanifold_edges))
+            row.label(text="%.0f%%" % (result.flat_bottom * 100))
+            row.label(text="%d/%d" % (result.thin_faces, result.wall_samples))
+        if len(_preflight_results) > len(rows):
+            layout.label(text="and %d more" % (len(_preflight_results) - len(rows)))
+
+# ------- PROFILING -----
+# @profiled records wall time, vert/face counts and peak memory per helper
+_profiling = False
+_profile_depth = 0
+_profile_records = []
+
+PROFILE_FIELDS = ("stage", "object", "depth", "seconds", "verts_before", "faces_before", "verts_after",
+                  "faces_after", "peak_mb", "peak_growth_mb")
+
+def setProfiling(enabled):
+    global _profiling
+    _profiling = bool(enabled)
+
+def peakMemoryMB():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports KB, macos bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def memoryMB():
+    # resident memory right now, where that can't be read the peak is the closest we have
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peakMemoryMB()
+
+def overMemoryBudget(budget_mb):
+    # a budget of 0 is no budget
+    memory = memoryMB() if budget_mb > 0 else None
+    return memory is not None and memory > budget_mb
+
+def freeMemory():
+    # low memory: drop the caches and leftover meshes, the channel cutters are tiny and stay
+    invalidateAnalysis()
+    _preview_cache.clear()
+    purgeTemp()
+    gc.collect()
+
+def meshCounts(obj):
+    if not isinstance(obj, bpy.types.Object) or obj.type != 'MESH':
+        return None, None
+    try:
+        return len(obj.data.vertices), len(obj.data.polygons)
+    except ReferenceError:
+        # removed by the stage
+        return None, None
+
+def beginStage(stage, obj):
+    # the record goes in when the stage starts, so nested stages are listed after the one they ran inside
+    global _profile_depth
+    verts, faces = meshCounts(obj)
+    record = {
+        "stage": stage,
+        "object": obj.name if obj is not None else "",
+        "depth": _profile_depth,
+        "seconds": None,
+        "verts_before": verts,
+        "faces_before": faces,
+        "verts_after": None,
+        "faces_after": None,
+        "peak_mb": None,
+        "peak_growth_mb": None,
+    }
+    _profile_records.append(record)
+    del _profile_records[:-PROFILE_MAX_RECORDS]
+    _profile_depth += 1
+    return record, obj, peakMemoryMB(), time.perf_counter()
+
+def endStage(state, result=None):
+    global _profile_depth
+    record, obj, peak_before, start = state
+    record["seconds"] = time.perf_counter() - start
+    _profile_depth = record["depth"]
+
+    # the bevels hand back a new object, count that one after
+    record["verts_after"], record["faces_after"] = meshCounts(result if isinstance(result, bpy.types.Object) else obj)
+    peak = peakMemoryMB()
+    if peak is not None:
+        record["peak_mb"] = peak
+        record["peak_growth_mb"] = peak - peak_before
+
+def profiled(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _profiling:
+            return fn(*args, **kwargs)
+
+        obj = kwargs.get("obj") or next((arg for arg in args if isinstance(arg, bpy.types.Object)), None)
+        state = beginStage(fn.__name__, obj)
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+            return result
+        finally:
+            endStage(state, result)
+    return wrapper
+
+@contextlib.contextmanager
+def profileStage(stage, obj=None):
+    # for timing a block inside a helper, like an operator call or a temp object delete
+    if not _profiling:
+        yield
+        return
+    state = beginStage(stage, obj)
+    try:
+        yield
+    finally:
+        endStage(state)
+
+def clearProfile():
+    _profile_records.clear()
+
+def writeProfile(filepath):
+    # .csv gets one row per stage, anything else is written as JSON
+    if filepath.lower().endswith(".csv"):
+        with open(filepath, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(_profile_records)
+    else:
+        with open(filepath, "w") as f:
+            json.dump({"records": _profile_records}, f, indent=1)
+    return len(_profile_records)
 
+# ------- HELPER FUNCTIONS -----
+def vertexCoords(mesh):
+    # bulk read of all vertex coords into an (N, 3) array, much faster than iterating mesh.vertices
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+def vertexZ(obj, world=True, coords=None):
+    if coords is None:
+        coords = vertexCoords(obj.data)
+    if not world:
+        return coords[:, 2].astype(np.float64)
+
+    # only the Z row of the world matrix matters, so this is one (N, 3) @ (3,) matmul
+    mat = np.array(obj.matrix_world, dtype=np.float64)
+    return coords @ mat[2, :3] + mat[2, 3]
+
+def zExtrema(obj, world=True, coords=None):
+    # returns (min z, max z, indices of verts at min z, indices of verts at max z)
+    z = vertexZ(obj, world, coords)
+    if not len(z):
+        return 10000, -10000, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    min_z = z.min()
+    max_z = z.max()
+    # mesh coords are single precision, keep returned values comparable against v.co
+    return float(np.float32(min_z)), float(np.float32(max_z)), np.flatnonzero(z == min_z), np.flatnonzero(z == max_z)
+
+# ------- MESH ANALYSIS CACHE -----
+# per mesh results, checked against a cheap fingerprint before reuse
+class MeshAnalysis:
+    def __init__(self, obj):
+        coords = vertexCoords(obj.data)
+        self.bottom_z, self.top_z, self.bottom_verts, self.top_verts = zExtrema(obj, coords=coords)
+
+        # world XY bounding box of the bottom footprint, and the median of the bottom verts for the channel cutouts
+        self.bbox = None
+        self.bottom_center = None
+        if len(self.bottom_verts):
+            mat = np.array(obj.matrix_world, dtype=np.float64)
+            bottom = coords[self.bottom_verts] @ mat[:3, :3].T + mat[:3, 3]
+            self.bbox = (tuple(bottom[:, :2].min(axis=0)), tuple(bottom[:, :2].max(axis=0)))
+            self.bottom_center = mathutils.Vector(bottom.mean(axis=0))
+
+_analysis_cache = OrderedDict()
+
+def meshFingerprint(obj):
+    mesh = obj.data
+    count = len(mesh.vertices)
+    checksum = 0.0
+    if count:
+        # a handful of evenly spaced verts is enough to notice most edits without reading the whole mesh
+        for i in np.linspace(0, count - 1, min(count, ANALYSIS_FINGERPRINT_SAMPLES), dtype=np.int64):
+            co = mesh.vertices[int(i)].co
+            checksum += co[0] + co[1] * 3.0 + co[2] * 7.0
+
+    return (count, len(mesh.edges), len(mesh.polygons), checksum, tuple(v for row in obj.matrix_world for v in row))
+
+def analyzeMesh(obj):
+    key = obj.data.as_pointer()
+    fingerprint = meshFingerprint(obj)
+
+    entry = _analysis_cache.get(key)
+    if entry and entry[0] == fingerprint:
+        _analysis_cache.move_to_end(key)
+        return entry[1]
+
+    analysis = MeshAnalysis(obj)
+    _analysis_cache[key] = (fingerprint, analysis)
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+    return analysis
+
+def invalidateAnalysis(obj=None):
+    if obj is None:
+        _analysis_cache.clear()
+    else:
+        _analysis_cache.pop(obj.data.as_pointer(), None)
+
+@bpy.app.handlers.persistent
+def invalidateAnalysisHandler(scene, depsgraph):
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object) and id_data.type == 'MESH':
+            id_data = id_data.data
+        if isinstance(id_data, bpy.types.Mesh):
+            _analysis_cache.pop(id_data.as_pointer(), None)
+
+@bpy.app.handlers.persistent
+def clearAnalysisHandler(*args):
+    invalidateAnalysis()
+    _cutter_cache.clear()
+    _preview_cache.clear()
+    _preflight_results.clear()
+
+@profiled
+def bottomZ(obj):
+    return analyzeMesh(obj).bottom_z
+
+def selectVerts(mesh, indices):
+    mask = np.zeros(len(mesh.vertices), dtype=bool)
+    mask[indices] = True
+    mesh.vertices.foreach_set("select", mask)
+
+def applyTransform(obj):
+    # same as transform_apply(rotation=True, scale=True), but works on obj directly so it doesn't need a selection
+    basis = obj.matrix_basis.to_3x3().to_4x4()
+    if np.allclose(np.array(basis), np.identity(4), atol=1e-6):
+        return
+    if obj.data.users > 1:
+        raise RuntimeError('Cannot apply to a multi user: Object "%s", Mesh "%s"' % (obj.name, obj.data.name))
+    obj.data.transform(basis)
+    # assigning matrix_world (rather than the basis) keeps it valid before the depsgraph next evaluates
+    obj.matrix_world = obj.matrix_world @ basis.inverted_safe()
+    invalidateAnalysis(obj)
+
+def setOriginToGeometry(obj):
+    # same as origin_set(type="ORIGIN_GEOMETRY") with the default median center, every user of the mesh stays put
+    mesh = obj.data
+    coords = vertexCoords(mesh)
+    if not len(coords):
+        return
+    center = mathutils.Vector(coords.astype(np.float64).mean(axis=0))
+    users = [other for other in bpy.data.objects if other.data == mesh] if mesh.users > 1 else [obj]
+    mesh.transform(mathutils.Matrix.Translation(-center))
+    for user in users:
+        user.matrix_world = user.matrix_world @ mathutils.Matrix.Translation(center)
+    invalidateAnalysis(obj)
+
+def selectOnly(context, obj):
+    for other in context.selected_objects:
+        other.select_set(False)
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+# ------- SCRATCH -----
+# temp objects that need evaluating go in one hidden collection that is reused
+SCRATCH_COLLECTION = "_ec3d_scratch"
+TEMP_PREFIX = "_basetemp"
+
+def scratchCollection(context):
+    collection = bpy.data.collections.get(SCRATCH_COLLECTION)
+    if collection is None:
+        collection = bpy.data.collections.new(SCRATCH_COLLECTION)
+        collection.hide_render = True
+    if context.scene.collection.children.get(collection.name) is None:
+        context.scene.collection.children.link(collection)
+    # hidden, but still evaluated (hiding the collection itself would stop its modifiers running)
+    setScratchVisible(context, False)
+    return collection
+
+def setScratchVisible(context, visible):
+    # edit mode operators skip hidden objects, so the scratch collection has to be shown while they run in it
+    layer = context.view_layer.layer_collection.children.get(SCRATCH_COLLECTION)
+    if layer is not None and layer.hide_viewport == visible:
+        layer.hide_viewport = not visible
+
+def scratchObject(context, name, mesh):
+    obj = bpy.data.objects.new(name, mesh)
+    scratchCollection(context).objects.link(obj)
+    return obj
+
+def removeTempObject(obj, remove_mesh=True):
+    mesh = obj.data
+    bpy.data.objects.remove(obj)
+    if remove_mesh and mesh is not None and not mesh.users:
+        bpy.data.meshes.remove(mesh)
+
+def removeUnusedMeshes(meshes):
+    for mesh in set(meshes):
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+
+def purgeTemp():
+    # returns the number of meshes removed. Cached cutter and preview meshes have no users between runs, keep them
+    collection = bpy.data.collections.get(SCRATCH_COLLECTION)
+    if collection is not None:
+        for obj in list(collection.objects):
+            removeTempObject(obj)
+    for obj in [o for o in bpy.data.objects if o.name.startswith(TEMP_PREFIX) and not o.users_collection]:
+        removeTempObject(obj)
+
+    keep = set(_cutter_cache.values()) | set(name for fingerprint, name in _preview_cache.values())
+    orphans = [m for m in bpy.data.meshes if not m.users and m.name.startswith(TEMP_PREFIX) and m.name not in keep]
+    for mesh in orphans:
+        bpy.data.meshes.remove(mesh)
+    return len(orphans)
+
+@profiled
 def fixBottom(obj, remove_depth=None):
     # make sure scale and rotation are applied or numbers won't work right
-    bpy.ops.object.transform_apply(rotation=True, scale=True)
+    applyTransform(obj)
 
-    bottom_z = bottomZ(obj)
+    # location isn't applied, so the bottom is read in the mesh's own space
+    coords = vertexCoords(obj.data)
+    bottom_z = zExtrema(obj, world=False, coords=coords)[0]
+    z = coords[:, 2]
     bm = bmesh.new()
     bm.from_mesh(obj.data)
-    modified = 0
+    modified = fixBottomBM(bm, bottom_z, remove_depth, z)[0]
 
-    if remove_depth:
-        bottom_z = bottom_z + remove_depth
-        # move all verts below the remove depth UP to that depth
-        for v in bm.verts:
-            if v.co[2] < bottom_z:
-                v.co[2] = bottom_z
-
-    # Fix any close tolerance verts to bottom Z
-    bottom_verts = []
-    bottom_edges = []
-    for v in bm.verts:
-        if (bottom_z + BOTTOM_TOLERANCE) > v.co[2] and bottom_z != v.co[2]:
-            modified += 1
-            v.co[2] = bottom_z
-
-    # select all verts and do merge by distance, then reslect only bottom verts that are left
-    bmesh.ops.remove_doubles(bm, verts=bottom_verts, dist=BOTTOM_MERGE_VERTS_DISTANCE)
-    for v in bm.verts:
-        if v.co[2] == bottom_z:
-            bottom_verts.append(v)
+    bm.to_mesh(obj.data)
+    bm.free()
+    obj.data.update()
+    invalidateAnalysis(obj)
 
+    return modified
 
-    # now select all edges and perform limited dissolve
-    for edge in bm.edges:
-        if edge.verts[0].co[2] == bottom_z and edge.verts[1].co[2] == bottom_z:
-            bottom_verts.append(edge.verts[0])
-            bottom_verts.append(edge.verts[1])
-            bottom_edges.append(edge)
+def fixBottomBM(bm, bottom_z, remove_depth=None, z=None):
+    # bmesh half of fixBottom, pass z (vert Z in bm.verts order) when it was already read
+    if z is None:
+        z = np.fromiter((v.co[2] for v in bm.verts), dtype=np.float32, count=len(bm.verts))
 
-    # Then limited dissolve bottom
-    bmesh.ops.dissolve_limit(bm, angle_limit=math.radians(1), verts=list(set(bottom_verts)), edges=list(set(bottom_edges)))
+    if remove_depth:
+        bottom_z = bottom_z + remove_depth
+    # coords are single precision, so bottom_z has to be too or the equality checks below never match
+    bottom_z = float(np.float32(bottom_z))
 
-    bm.to_mesh(obj.data)
-    obj.data.update()
+    band = np.flatnonzero(z < bottom_z + BOTTOM_TOLERANCE)
+    if not len(band):
+        return 0, bottom_z
+    modified = int(np.count_nonzero(z[band] != bottom_z))
 
-    return modified
+    if remove_depth:
+        # cut away and cap everything below the remove depth, squashing it flat folds slanted walls into slivers
+        bm.verts.ensure_lookup_table()
+        cut_verts = [bm.verts[i] for i in band]
+        cut_edges = set(e for v in cut_verts for e in v.link_edges)
+        cut_faces = set(f for v in cut_verts for f in v.link_faces)
+        cut = bmesh.ops.bisect_plane(bm, geom=cut_verts + list(cut_edges) + list(cut_faces), dist=0.0001,
+                                     plane_co=(0.0, 0.0, bottom_z), plane_no=(0.0, 0.0, 1.0), clear_inner=True)
+        cap_edges = [e for e in cut["geom_cut"] if isinstance(e, bmesh.types.BMEdge) and e.is_valid and e.is_boundary]
+        if cap_edges:
+            bmesh.ops.holes_fill(bm, edges=cap_edges, sides=0)
+        # the band is now what survived the cut plus the verts the cut made
+        new_verts = [v for v in cut["geom_cut"] if isinstance(v, bmesh.types.BMVert)]
+        bottom_verts = list(dict.fromkeys([v for v in cut_verts if v.is_valid] + new_verts))
+    else:
+        bm.verts.ensure_lookup_table()
+        bottom_verts = [bm.verts[i] for i in band]
+
+    # close tolerance verts snap down to the bottom
+    for v in bottom_verts:
+        v.co[2] = bottom_z
+
+    # merge by distance, only within the band
+    targetmap = bandMergeMap(bottom_verts, BOTTOM_MERGE_VERTS_DISTANCE)
+    if targetmap:
+        bmesh.ops.weld_verts(bm, targetmap=targetmap)
+        # walls squashed flat by the snap leave zero area faces behind, collapse those too
+        band_edges = list(set(e for v in bottom_verts if v.is_valid for e in v.link_edges))
+        bmesh.ops.dissolve_degenerate(bm, dist=BOTTOM_MERGE_VERTS_DISTANCE, edges=band_edges)
+        # collapsed edges come back as new verts off the bottom by up to dist, so flood out from the survivors to
+        # pick those up again, then snap the lot back down
+        bottom_verts = [v for v in bottom_verts if v.is_valid]
+        bottom_set = set(bottom_verts)
+        stack = list(bottom_verts)
+        while stack:
+            v = stack.pop()
+            for e in v.link_edges:
+                other = e.other_vert(v)
+                if other not in bottom_set and other.co[2] < bottom_z + BOTTOM_MERGE_VERTS_DISTANCE:
+                    bottom_set.add(other)
+                    bottom_verts.append(other)
+                    stack.append(other)
+        for v in bottom_verts:
+            v.co[2] = bottom_z
 
-def exportToFolder(context, filepath, add_folder=None):
-    # Path comes in with /path/blah/whatever.stl or as just a dir
+    # dissolve_limit works from face normals, which are stale after the snap
+    bm.normal_update()
+
+    # dissolve_faces the flat bottom first, dissolve_limit alone takes seconds on a dense bottom
+    bottom_set = set(bottom_verts)
+    flat_faces = set(f for v in bottom_verts for f in v.link_faces if all(u in bottom_set for u in f.verts))
+    if len(flat_faces) > 1:
+        bmesh.ops.dissolve_faces(bm, faces=list(flat_faces), use_verts=False)
+        bottom_verts = [v for v in bottom_verts if v.is_valid]
+        bottom_set = set(bottom_verts)
+
+    # bottom edges are the ones with both verts in the band, then limited dissolve the bottom
+    bottom_edges = set(e for v in bottom_verts for e in v.link_edges if e.other_vert(v) in bottom_set)
+    bmesh.ops.dissolve_limit(bm, angle_limit=math.radians(1), verts=bottom_verts, edges=list(bottom_edges))
+
+    return modified, bottom_z
+
+def bandMergeMap(verts, dist):
+    # {vert: vert it merges into} for verts closer than dist, each cluster merges into its first vert
+    tree = mathutils.kdtree.KDTree(len(verts))
+    for i, v in enumerate(verts):
+        tree.insert(v.co, i)
+    tree.balance()
+
+    targetmap = {}
+    targets = set()
+    for i, v in enumerate(verts):
+        if v in targetmap:
+            continue
+        for co, j, d in tree.find_range(v.co, dist):
+            other = verts[j]
+            # a vert that already has others merged into it stays put, so there are no chains
+            if j == i or other in targetmap or other in targets:
+                continue
+            targetmap[other] = v
+            targets.add(v)
+    return targetmap
+
+def meshObjects(objects):
+    # empties, cameras, lights etc. have nothing to export
+    return [obj for obj in objects if obj.type == 'MESH']
+
+@profiled
+def exportToFolder(context, filepath, add_folder=None, incremental=False, dedup=False, preflight=False,
+                   export_format='STL'):
+    save_to = exportFolder(context, filepath, add_folder)
+    return exportObjects(context, context.selected_objects, save_to, incremental, dedup, preflight, export_format,
+                         manifest=True)
+
+def exportFolder(context, filepath, add_folder=None):
+    # Path comes in with /path/blah/whatever.stl (or any of the other export formats) or as just a dir
 
     save_to = filepath
-    if filepath.endswith(".stl"):
+    if filepath.lower().endswith(tuple(ext for label, ext, writer in EXPORT_FORMATS.values())):
         save_to = os.path.dirname(filepath)
 
     if add_folder:
@@ -142,254 +674,1656 @@ def exportToFolder(context, filepath, add_folder=None):
 
     context.scene.ec3d.export_path = save_to
     print("NEW LOCATION = " + save_to)
+    return save_to
+
+@profiled
+def exportObjects(context, objects, save_to, incremental=False, dedup=False, preflight=False, export_format='STL',
+                  manifest=False):
+    objects = meshObjects(objects)
+    steps = exportSteps(objects, save_to, incremental, dedup, preflight, export_format, manifest)
+    return runSteps(context, steps, len(objects))
+
+def exportSteps(objects, save_to, incremental=False, dedup=False, preflight=False, export_format='STL',
+                manifest=False):
+    # step generator (see runSteps), one file per object, nothing is moved into place until all are written
+    pending = threading.BoundedSemaphore(EXPORT_MAX_PENDING)
+    entries = loadExportManifest(save_to) if incremental or manifest else {}
+    label, ext, writer = EXPORT_FORMATS[export_format]
+    objects = meshObjects(objects)
+
+    def write(fpath, coords, tris):
+        try:
+            return writer(fpath, coords, tris)
+        finally:
+            pending.release()
+
+    start = time.perf_counter()
+    futures = {}
+    hashes = {}
+    counts = {}
+    checks = []
+    skipped = 0
+    written = 0
+    groups = dedupGroups(objects) if dedup else [[obj] for obj in objects]
+    try:
+        with ThreadPoolExecutor(max_workers=EXPORT_THREADS) as pool:
+            done = 0
+            for group in groups:
+                context = yield done
+                done += len(group)
+                obj = group[0]
+                fname = obj.name + ext
+                counts[fname] = {"count": len(group), "objects": [copy.name for copy in group]}
+                fpath = os.path.join(save_to, fname)
+                depsgraph = context.evaluated_depsgraph_get()
+                if preflight:
+                    check = preflightCheck(obj, depsgraph)
+                    checks.extend((copy.name, check) for copy in group)
+                coords, tris = meshBuffers(obj, depsgraph)
+                digest = hashlib.blake2b(coords.tobytes(), digest_size=16)
+                digest.update(tris.tobytes())
+                hashes[fname] = digest.hexdigest()
+                if incremental and exportUnchanged(entries.get(fname), fpath, hashes[fname]):
+                    skipped += 1
+                    continue
+
+                pending.acquire()
+                futures[fname] = pool.submit(write, fpath + EXPORT_PART_SUFFIX, coords, tris)
+            # the last step waits for the writes and moves the files into place
+            yield len(objects)
+
+        for future in futures.values():
+            written += future.result()
+    except BaseException:
+        # cancelled or a write failed, the pool has finished with the part files by now
+        for fname in futures:
+            part = os.path.join(save_to, fname) + EXPORT_PART_SUFFIX
+            if os.path.exists(part):
+                os.remove(part)
+        raise
+
+    for fname in futures:
+        fpath = os.path.join(save_to, fname)
+        os.replace(fpath + EXPORT_PART_SUFFIX, fpath)
+        stat = os.stat(fpath)
+        entries[fname] = {"hash": hashes[fname], "mtime": stat.st_mtime, "size": stat.st_size}
+    if manifest:
+        writeJSON(os.path.join(save_to, EXPORT_MANIFEST), entries)
+    if dedup:
+        writeJSON(os.path.join(save_to, EXPORT_COUNTS), counts)
+    if preflight:
+        _preflight_results[:] = checks
+
+    flagged = sum(1 for name, check in checks if check.problems())
+    return ExportStats(len(futures), written, time.perf_counter() - start, skipped, flagged)
+
+def exportUnchanged(entry, fpath, mesh_hash):
+    if not entry or entry.get("hash") != mesh_hash or not os.path.isfile(fpath):
+        return False
+    stat = os.stat(fpath)
+    return stat.st_mtime == entry.get("mtime") and stat.st_size == entry.get("size")
+
+def loadExportManifest(folder):
+    try:
+        with open(os.path.join(folder, EXPORT_MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def writeJSON(filepath, data):
+    # written next to filepath and moved over it, so a reader never sees half a file
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix=EXPORT_PART_SUFFIX)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(temp, filepath)
+    except BaseException:
+        os.remove(temp)
+        raise
+
+class ExportStats:
+    def __init__(self, files, written, seconds, skipped=0, flagged=0):
+        self.files = files
+        self.bytes = written
+        self.seconds = seconds
+        self.skipped = skipped
+        # objects that failed the preflight check
+        self.flagged = flagged
+
+    def summary(self):
+        mb = self.bytes / (1024 * 1024)
+        rate = mb / self.seconds if self.seconds > 0 else 0.0
+        summary = "%s written, %s skipped, %.1f MB in %.2fs (%.1f MB/s)" % (
+            self.files, self.skipped, mb, self.seconds, rate)
+        if self.flagged:
+            summary += ", %s failed preflight" % self.flagged
+        return summary
+
+# ------- STL WRITER -----
+# 80 byte header, uint32 triangle count, then 50 bytes per triangle
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("verts", "<f4", (3, 3)), ("attr", "<u2")])
+
+def meshTriangles(obj, depsgraph):
+    # world space triangles of the evaluated mesh (modifiers applied, same as the STL exporter) as (T, 3, 3)
+    coords, tris = meshBuffers(obj, depsgraph)
+    return coords[tris]
+
+def meshBuffers(obj, depsgraph):
+    # the evaluated mesh as world space (V, 3) float32 verts and (T, 3) int32 triangles indexing into them
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        coords = vertexCoords(mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    mat = np.array(eval_obj.matrix_world, dtype=np.float64)
+    tris = tris.reshape(-1, 3)
+    if np.linalg.det(mat[:3, :3]) < 0:
+        # mirrored objects would otherwise come out inside out
+        tris = tris[:, ::-1]
+    world = (coords @ mat[:3, :3].T + mat[:3, 3]).astype(np.float32)
+    return world, tris
+
+def stlRecords(tris):
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    records = np.zeros(len(tris), dtype=STL_RECORD)
+    records["normal"] = normals
+    records["verts"] = tris
+    return records
+
+def stlHeader(tri_count):
+    return b"Binary STL exported by EC3D Base Tools".ljust(80, b" ") + np.uint32(tri_count).tobytes()
+
+def writeBinarySTL(filepath, tris):
+    # returns the number of bytes written
+    with open(filepath, "wb") as f:
+        f.write(stlHeader(len(tris)))
+        stlRecords(tris).tofile(f)
+    return 84 + STL_RECORD.itemsize * len(tris)
+
+def writeSTL(filepath, coords, tris):
+    return writeBinarySTL(filepath, coords[tris])
+
+# ------- PLY WRITER -----
+# binary little endian, every vert is written once
+PLY_FACE = np.dtype([("count", "u1"), ("verts", "<i4", (3,))])
+
+def plyHeader(vert_count, tri_count):
+    return ("ply\n"
+            "format binary_little_endian 1.0\n"
+            "comment exported by EC3D Base Tools\n"
+            "element vertex %d\n"
+            "property float x\n"
+            "property float y\n"
+            "property float z\n"
+            "element face %d\n"
+            "property list uchar int vertex_indices\n"
+            "end_header\n" % (vert_count, tri_count)).encode("ascii")
+
+def writePLY(filepath, coords, tris):
+    # returns the number of bytes written
+    faces = np.empty(len(tris), dtype=PLY_FACE)
+    faces["count"] = 3
+    faces["verts"] = tris
+    header = plyHeader(len(coords), len(tris))
+    with open(filepath, "wb") as f:
+        f.write(header)
+        coords.astype("<f4").tofile(f)
+        faces.tofile(f)
+    return len(header) + 12 * len(coords) + PLY_FACE.itemsize * len(tris)
+
+# ------- 3MF WRITER -----
+# zipped XML model with an indexed vertex list, streamed a block of rows at a time
+THREEMF_MODEL = "3D/3dmodel.model"
+THREEMF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>\n')
+THREEMF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/' + THREEMF_MODEL + '" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>\n')
+THREEMF_VERTEX = '<vertex x="%.7g" y="%.7g" z="%.7g"/>\n'
+THREEMF_TRIANGLE = '<triangle v1="%d" v2="%d" v3="%d"/>\n'
+THREEMF_BLOCK_ROWS = 65536
+# deflate level, above 1 is a lot slower for very little smaller
+THREEMF_COMPRESS_LEVEL = 1
+
+def xmlRows(template, rows):
+    # yields the rows formatted with template, a block at a time
+    for begin in range(0, len(rows), THREEMF_BLOCK_ROWS):
+        block = rows[begin:begin + THREEMF_BLOCK_ROWS]
+        yield ((template * len(block)) % tuple(block.ravel().tolist())).encode("ascii")
+
+def write3MF(filepath, coords, tris):
+    # returns the number of bytes written
+    with zipfile.ZipFile(filepath, "w", zipfile.ZIP_DEFLATED, compresslevel=THREEMF_COMPRESS_LEVEL) as archive:
+        archive.writestr("[Content_Types].xml", THREEMF_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", THREEMF_RELS)
+        with archive.open(THREEMF_MODEL, "w", force_zip64=True) as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    b'<model unit="millimeter" xml:lang="en-US" '
+                    b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                    b'<resources><object id="1" type="model"><mesh>\n<vertices>\n')
+            for chunk in xmlRows(THREEMF_VERTEX, coords.astype(np.float64)):
+                f.write(chunk)
+            f.write(b'</vertices>\n<triangles>\n')
+            for chunk in xmlRows(THREEMF_TRIANGLE, tris):
+                f.write(chunk)
+            f.write(b'</triangles>\n</mesh></object></resources>\n'
+                    b'<build><item objectid="1"/></build>\n</model>\n')
+    return os.path.getsize(filepath)
+
+# formats the exports can write: label, file extension and writer(filepath, coords, tris) -> bytes written
+EXPORT_FORMATS = OrderedDict((
+    ('STL', ("STL", ".stl", writeSTL)),
+    ('3MF', ("3MF", ".3mf", write3MF)),
+    ('PLY', ("PLY (binary)", ".ply", writePLY)),
+))
+
+@profiled
+def duplicate(context, obj, name_append=None):
+    new_obj = obj.copy()
+    new_obj.data = obj.data.copy()
+    for collection in obj.users_collection:
+        collection.objects.link(new_obj)
+    selectOnly(context, new_obj)
 
-    orig_selection = context.selected_objects
-    for obj in orig_selection:
-        bpy.ops.object.select_all(action='DESELECT')
-
-        fname = obj.name
-        fpath = os.path.join(save_to, fname + ".stl")
-
-        bpy.context.view_layer.objects.active = obj
-        obj.select_set(True)
-
-        bpy.ops.export_mesh.stl(filepath=fpath, check_existing=False, use_selection=True)
-
-    # reselect
-    for obj in orig_selection:
-        bpy.context.view_layer.objects.active = obj
-        obj.select_set(True)
-
-    return len(orig_selection)
-
-def duplicate(context, name_append=None):
-    orig_name = context.object.name
-    bpy.ops.object.duplicate(linked=False)
-    new_obj = context.object
     # set origin to center of geometry
-    bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY")
+    setOriginToGeometry(new_obj)
     # rename it appropriately
     if name_append:
-        new_obj.name = orig_name+" ["+name_append+"]"
+        new_obj.name = obj.name+" ["+name_append+"]"
 
-    # move it X to the width of the obj
-    width = new_obj.dimensions[0]
-    new_obj.location.x = new_obj.location.x-width
+    # move it X to the width of the obj (the copy hasn't been evaluated yet, so measure the original)
+    width = obj.dimensions[0]
+    new_obj.matrix_world = mathutils.Matrix.Translation((0 - width, 0.0, 0.0)) @ new_obj.matrix_world
 
     return new_obj
 
-def scaleCubeToChanne(obj):
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_mode(type="VERT")
-    bpy.ops.mesh.select_all(action='DESELECT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    bpy.ops.transform.resize(value=(1.0, 100, .8))
-
-    top_z = topZ(obj)
-    selected = []
-    for v in obj.data.vertices:
-        if v.co[2] == top_z:
-            v.select = True
-            selected.append(v)
-        else:
-            v.select = False
-
-    bpy.ops.object.mode_set(mode='EDIT')
-    # now that all verts are selected scale 50% on X axis
-    bpy.ops.transform.resize(value=(.04, 1.0, 1.0))
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-
-def selectBottomVerts(context, obj):
+@profiled
+def selectBottomVerts(context, obj, analysis=None):
     #NOTE this operation assumes fix_bottom has been run, so if not you might miss many vertices
+    # toggling edit mode below fires depsgraph updates that drop the cached analysis, so grab it first
+    if analysis is None and obj.mode == 'OBJECT':
+        analysis = analyzeMesh(obj)
     bpy.ops.object.mode_set(mode='EDIT')
     bpy.ops.mesh.select_mode(type="VERT")
     bpy.ops.mesh.select_all(action='DESELECT')
     bpy.ops.object.mode_set(mode='OBJECT')
 
-    bottom_z = bottomZ(obj)
-
-    selected = []
-    for v in obj.data.vertices:
-        if v.co[2] == bottom_z:
-            v.select = True
-            selected.append(v)
-        else:
-            v.select = False
+    if analysis is None:
+        analysis = analyzeMesh(obj)
+    bottom_verts = analysis.bottom_verts
+    selectVerts(obj.data, bottom_verts)
+    selected = [obj.data.vertices[i] for i in bottom_verts]
 
     bpy.ops.object.mode_set(mode='EDIT')
     bpy.ops.mesh.select_mode(type="VERT")
     context.view_layer.objects.active = context.view_layer.objects.active
     return selected
 
-def basicBevel(context, additive=False):
-    bpy.ops.object.mode_set(mode='OBJECT')
-    obj = duplicate(context, 'simple_base_bevel')
-    fixBottom(obj, remove_depth=None if additive else BASE_BEVEL_DEPTH)
+@profiled
+def basicBevel(context, obj, additive=False):
+    if obj.mode != 'OBJECT':
+        context.view_layer.objects.active = obj
+        bpy.ops.object.mode_set(mode='OBJECT')
+    new_obj = duplicate(context, obj, 'simple_base_bevel')
+    bevelObject(context, new_obj, additive)
 
-    # select bottom verts, then put 3D cursor to center of selected
-    selectBottomVerts(context, obj)
-    # now extrude down the right distance
-    bpy.ops.mesh.extrude_region_move(TRANSFORM_OT_translate={"value": (0.0, 0.0, 0 - BASE_BEVEL_DEPTH)})
-    obj.data.update()
+    return new_obj
 
-    selected_verts = [v for v in obj.data.vertices if v.select]
-    coords = []
-    for vert in selected_verts:
-        coords.append([vert.co[0], vert.co[1]])
+@profiled
+def bevelObject(context, obj, additive=False):
+    # fix the bottom and bevel obj in place
+    if useSlab(context, obj):
+        return runOnSlab(context, obj, lambda context, slab: bevelObject(context, slab, additive),
+                         context.scene.ec3d.bevel_depth)
 
-    x_coordinates, y_coordinates = zip(*coords)
-    bounding_box = [(min(x_coordinates), min(y_coordinates)), (max(x_coordinates), max(y_coordinates))]
+    settings = context.scene.ec3d
+    depth = settings.bevel_depth
+    shrink = settings.bevel_shrink
+    if settings.use_fast_path:
+        fastBevel(obj, additive, depth, shrink)
+        return obj
 
-    # rudimentary, we're just gonna find the width of the bounding box, an scale down till its roughly th size
-    # we want based on SIMPLE_BEVEL_SHRINK_DISTANCE
-    width = abs(bounding_box[1][0] - bounding_box[0][0])
-    target_width = width - (SIMPLE_BEVEL_SHRINK_DISTANCE * 2)
-    scale = target_width / width
+    fixBottom(obj, remove_depth=None if additive else depth)
 
-    bpy.ops.transform.resize(value=(scale, scale, 1.0))
-    obj.data.update()
+    # select bottom verts
+    context.view_layer.objects.active = obj
+    selectBottomVerts(context, obj)
+    # now extrude down the right distance
+    with profileStage("extrude_region_move", obj):
+        bpy.ops.mesh.extrude_region_move(TRANSFORM_OT_translate={"value": (0.0, 0.0, 0 - depth)})
+        obj.data.update()
 
-    # now snap cursor to bottom center
-    bpy.ops.view3d.snap_cursor_to_selected()
-    bpy.ops.object.mode_set(mode='OBJECT')
+    with profileStage("mode_set", obj):
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    # and pull the new bottom in by the shrink distance
+    insetBottom(obj.data, shrink)
+    invalidateAnalysis(obj)
 
     return obj
 
-def channelCutout(context, obj, is_large=False):
-    # we know cursor is at the center bottom due to previous op (fixBottom)
-    cursor = bpy.context.scene.cursor.location
-
-    # Create center sphere
-    bpy.ops.mesh.primitive_uv_sphere_add(segments=50, ring_count=25, radius=3.5,
-                                         location=(cursor[0], cursor[1], cursor[2] - 2))
-    sphere = bpy.context.active_object
-    sphere.name = "_basetemp_center"
-
-    # Create first cube (cutout)
-    bpy.ops.mesh.primitive_cube_add(size=2.2, location=(cursor[0], cursor[1], cursor[2] + .5))
-    cube1 = bpy.context.active_object
-    cube1.name = "_basetemp_cube1"
-    scaleCubeToChanne(cube1)
-    bpy.ops.object.origin_set(type='GEOMETRY_ORIGIN')
-    # Duplicate cube and rotate 90 degrees
-    bpy.ops.object.duplicate(linked=False)
-    cube2 = bpy.context.active_object
-    cube2.name = "_basetemp_cube2"
-    bpy.ops.transform.rotate(value=math.radians(90), orient_axis='Z', orient_type='GLOBAL')
-    if is_large:
-        bpy.ops.object.duplicate(linked=False)
-        cube3 = bpy.context.active_object
-        cube3.name = "_basetemp_cube3"
-        bpy.ops.transform.translate(value=(0.0,0.0,.01))
-        bpy.ops.transform.rotate(value=math.radians(45), orient_axis='Z', orient_type='GLOBAL')
-        bpy.ops.object.duplicate(linked=False)
-        cube4 = bpy.context.active_object
-        cube4.name = "_basetemp_cube4"
-        bpy.ops.transform.rotate(value=math.radians(90), orient_axis='Z', orient_type='GLOBAL')
-
-    # Create 3rd cube to cut top flat where we want it
-    cube_size = 200
-    bpy.ops.mesh.primitive_cube_add(size=cube_size, location=(cursor[0], cursor[1], cursor[2] + (cube_size/2) + BASE_BEVEL_DEPTH - .01))
-    cut_cube = bpy.context.active_object
-    cut_cube.name = "_basetemp_cutcube"
-
-    # Now create all modifiers
-    cube_1_add_mod = "_basetemp_mod1"
-    bool_add1 = sphere.modifiers.new(type="BOOLEAN", name=cube_1_add_mod)
-    bool_add1.object = cube1
-    bool_add1.operation = 'UNION'
-    cube_2_add_mod = "_basetemp_mod2"
-    bool_add1 = sphere.modifiers.new(type="BOOLEAN", name=cube_2_add_mod)
-    bool_add1.object = cube2
-    bool_add1.operation = 'UNION'
-    if is_large:
-        cube_3_add_mod = "_basetemp_mod2"
-        bool_add1 = sphere.modifiers.new(type="BOOLEAN", name=cube_3_add_mod)
-        bool_add1.object = cube3
-        bool_add1.operation = 'UNION'
-        cube_4_add_mod = "_basetemp_mod2"
-        bool_add1 = sphere.modifiers.new(type="BOOLEAN", name=cube_4_add_mod)
-        bool_add1.object = cube4
-        bool_add1.operation = 'UNION'
-
-    cut_cube_cut_mod = "_basetemp_mod3"
-    bool_cut1 = sphere.modifiers.new(type="BOOLEAN", name=cut_cube_cut_mod)
-    bool_cut1.object = cut_cube
-    bool_cut1.operation = 'DIFFERENCE'
-    obj_cut_mod = "_basetemp_mod4"
-    bool_cut2 = obj.modifiers.new(type="BOOLEAN", name=obj_cut_mod)
-    bool_cut2.object = sphere
-    bool_cut1.operation = 'DIFFERENCE'
-
-    # Now apply modifier for final channel cut obj to base
-    context.view_layer.objects.active = obj
-    bpy.ops.object.modifier_apply(modifier=obj_cut_mod)
+@profiled
+def fastBevel(obj, additive=False, depth=BASE_BEVEL_DEPTH, shrink=SIMPLE_BEVEL_SHRINK_DISTANCE):
+    # same result as fixBottom + the bevel in bevelObject, but done in one bmesh session with no edit mode round trips
+    applyTransform(obj)
+
+    coords = vertexCoords(obj.data)
+    z = coords[:, 2]
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    bottom_z = fixBottomBM(bm, zExtrema(obj, world=False, coords=coords)[0], None if additive else depth, z)[1]
+    bevelBottomBM(bm, bottom_z, depth)
 
-    # Finally delete all the temp objects
-    obj.select_set(False)
-    sphere.select_set(True)
-    cube1.select_set(True)
-    cube2.select_set(True)
+    bm.to_mesh(obj.data)
+    bm.free()
+    insetBottom(obj.data, shrink)
+    invalidateAnalysis(obj)
+
+def bevelBottomBM(bm, bottom_z, depth=BASE_BEVEL_DEPTH):
+    # extrude the flat bottom down by depth, insetBottom() then pulls it in once it's back in the mesh
+    bottom_z = float(np.float32(bottom_z))
+    bottom_verts = set(v for v in bm.verts if v.co[2] == bottom_z)
+    if not bottom_verts:
+        return None
+
+    # walk out from the bottom verts rather than scanning every edge and face of the mesh
+    bottom_edges = set(e for v in bottom_verts for e in v.link_edges if e.other_vert(v) in bottom_verts)
+    bottom_faces = set(f for v in bottom_verts for f in v.link_faces if all(fv in bottom_verts for fv in f.verts))
+
+    extruded = bmesh.ops.extrude_face_region(bm, geom=list(bottom_verts) + list(bottom_edges) + list(bottom_faces))
+    new_verts = [g for g in extruded["geom"] if isinstance(g, bmesh.types.BMVert)]
+
+    bmesh.ops.translate(bm, verts=new_verts, vec=(0.0, 0.0, 0 - depth))
+
+def insetBottom(mesh, shrink=SIMPLE_BEVEL_SHRINK_DISTANCE):
+    # moves the bottom outline verts shrink inward along their miters, capped at BEVEL_MITER_LIMIT * shrink
+    coords = vertexCoords(mesh)
+    if not len(coords) or not len(mesh.polygons):
+        return 0
+    z = coords[:, 2]
+    bottom_z = z.min()
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+
+    # bottom faces are the ones with every vert on the bottom, outline edges are the ones only one of them uses
+    bottom_faces = np.maximum.reduceat(z[loop_verts], loop_start) == bottom_z
+    face_of_loop = np.repeat(np.arange(len(loop_start)), loop_total)
+    loop_next = np.repeat(loop_start, loop_total) + (np.arange(len(loop_verts)) - np.repeat(loop_start, loop_total) + 1) % \
+        np.repeat(loop_total, loop_total)
+    bottom_loops = np.flatnonzero(bottom_faces[face_of_loop])
+    edge_use = np.bincount(loop_edges[bottom_loops], minlength=len(mesh.edges))
+    outline = bottom_loops[edge_use[loop_edges[bottom_loops]] == 1]
+    normals = normals.reshape(-1, 3)
+
+    if len(outline):
+        # inward is face normal x edge direction, the left of the edge seen from the side the face points at
+        start = loop_verts[outline]
+        end = loop_verts[loop_next[outline]]
+        direction = coords[end, :2].astype(np.float64) - coords[start, :2]
+        side = np.sign(normals[face_of_loop[outline], 2])[:, None]
+        inward = np.column_stack((-direction[:, 1], direction[:, 0])) * side
+    else:
+        # open bottom: the outline is the boundary edges along the bottom, inward is away from their wall
+        edge_use = np.bincount(loop_edges, minlength=len(mesh.edges))
+        outline = np.flatnonzero((z[loop_verts] == bottom_z) & (z[loop_verts[loop_next]] == bottom_z) &
+                                 (edge_use[loop_edges] == 1))
+        if not len(outline):
+            return scaleBottom(mesh, coords, shrink)
+        start = loop_verts[outline]
+        end = loop_verts[loop_next[outline]]
+        inward = 0 - normals[face_of_loop[outline], :2].astype(np.float64)
+    length = np.linalg.norm(inward, axis=1)
+    inward[length > 0] /= length[length > 0, None]
+
+    miter = np.zeros((len(coords), 2))
+    np.add.at(miter, start, inward)
+    np.add.at(miter, end, inward)
+    edge_count = np.bincount(np.concatenate((start, end)), minlength=len(coords))
+    moved = np.flatnonzero(edge_count)
+    miter = miter[moved]
+    length_sq = (miter ** 2).sum(axis=1)
+    offset = np.zeros_like(miter)
+    corner = (edge_count[moved] == 2) & (length_sq > 1e-12)
+    offset[corner] = 2 * shrink * miter[corner] / length_sq[corner, None]
+    # where the outline touches itself a vert has 4+ outline edges and no single corner, just step in by shrink
+    pinch = (edge_count[moved] != 2) & (length_sq > 1e-12)
+    offset[pinch] = shrink * miter[pinch] / np.sqrt(length_sq[pinch])[:, None]
+    length = np.linalg.norm(offset, axis=1)
+    limit = BEVEL_MITER_LIMIT * shrink
+    offset[length > limit] *= (limit / length[length > limit])[:, None]
+
+    coords[moved, :2] += offset.astype(np.float32)
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
+    return len(moved)
+
+def scaleBottom(mesh, coords, shrink):
+    # last resort when the bottom has no outline to inset along, scale it so it's 2 * shrink narrower
+    bottom = np.flatnonzero(coords[:, 2] == coords[:, 2].min())
+    lo = coords[bottom, :2].min(axis=0)
+    hi = coords[bottom, :2].max(axis=0)
+    width = float((hi - lo).max())
+    if width <= 0:
+        print("EC3D: the bottom of %s is a single point, nothing to inset" % mesh.name)
+        return 0
+
+    print("EC3D: no outline on the bottom of %s, scaling it instead" % mesh.name)
+    center = (lo + hi) / 2
+    coords[bottom, :2] = center + (coords[bottom, :2] - center) * (max(width - 2 * shrink, 0) / width)
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
+    return len(bottom)
+
+# ------- CHANNEL CUTTER -----
+# sphere plus tapered channel bars built in bmesh, unioned once per variant
+CHANNEL_SPHERE_RADIUS = 3.5
+CHANNEL_SPHERE_DROP = 2
+CHANNEL_BAR_SIZE = 2.2
+CHANNEL_BAR_LIFT = .5
+CHANNEL_BAR_LENGTH_SCALE = 100
+CHANNEL_BAR_HEIGHT_SCALE = .8
+CHANNEL_BAR_TOP_TAPER = .04
+
+_cutter_cache = {}
+
+@profiled
+def channelCutterMesh(context, is_large=False, depth=BASE_BEVEL_DEPTH):
+    # cutter meshes are built around (0, 0, 0) = bottom center, and reused for every base with the same settings
+    key = (is_large, round(depth, 6))
+    name = _cutter_cache.get(key)
+    mesh = bpy.data.meshes.get(name) if name else None
+    if mesh is not None:
+        return mesh
+
+    mesh = bpy.data.meshes.new("_basetemp_cutter_" + ("large" if is_large else "small"))
+    bm = bmesh.new()
+    clip_z = depth - .01
+
+    # center sphere, with the part above clip_z cut off and capped
+    sphere = bmesh.ops.create_uvsphere(bm, u_segments=50, v_segments=25, radius=CHANNEL_SPHERE_RADIUS,
+                                       matrix=mathutils.Matrix.Translation((0.0, 0.0, 0 - CHANNEL_SPHERE_DROP)))
+    sphere_geom = sphere["verts"] + list(set(e for v in sphere["verts"] for e in v.link_edges)) + \
+                  list(set(f for v in sphere["verts"] for f in v.link_faces))
+    cut = bmesh.ops.bisect_plane(bm, geom=sphere_geom, plane_co=(0.0, 0.0, clip_z), plane_no=(0.0, 0.0, 1.0),
+                                 clear_outer=True)
+    cap_edges = [e for e in cut["geom_cut"] if isinstance(e, bmesh.types.BMEdge)]
+    bmesh.ops.holes_fill(bm, edges=cap_edges, sides=0)
+
+    # channel bars, the large cutter adds a second pair at 45 degrees (raised slightly, as it always has been)
+    angles = [(0, 0.0), (90, 0.0)]
     if is_large:
-        cube3.select_set(True)
-        cube4.select_set(True)
-    cut_cube.select_set(True)
-    bpy.ops.object.delete()
+        angles += [(45, .01), (135, .01)]
+    for angle, lift in angles:
+        channelBarBM(bm, math.radians(angle), CHANNEL_BAR_LIFT + lift, clip_z)
+
+    bm.normal_update()
+    bm.to_mesh(mesh)
+    bm.free()
+
+    # resolve the overlapping shells into one watertight solid once, so each base only needs a plain difference
+    shells = scratchObject(context, "_basetemp_cutter_shells", mesh)
+    union = shells.modifiers.new(type="BOOLEAN", name="_basetemp_cuttermod")
+    union.operand_type = 'COLLECTION'
+    union.operation = 'UNION'
+    union.solver = 'EXACT'
+    union.use_self = True
+    depsgraph = context.evaluated_depsgraph_get()
+    solid = bpy.data.meshes.new_from_object(shells.evaluated_get(depsgraph))
+    solid.name = mesh.name
+    removeTempObject(shells)
+
+    _cutter_cache[key] = solid.name
+    return solid
+
+def channelBarBM(bm, angle, lift, clip_z):
+    # a long bar whose top edge is squeezed to CHANNEL_BAR_TOP_TAPER of its width, clipped flat at clip_z
+    half = CHANNEL_BAR_SIZE / 2
+    half_height = half * CHANNEL_BAR_HEIGHT_SCALE
+    half_length = half * CHANNEL_BAR_LENGTH_SCALE
+    bottom_z = lift - half_height
+    top_z = lift + half_height
+    bottom_width = half
+    top_width = half * CHANNEL_BAR_TOP_TAPER
+    if clip_z < top_z:
+        t = (clip_z - bottom_z) / (top_z - bottom_z)
+        top_width = bottom_width + (top_width - bottom_width) * t
+        top_z = clip_z
+
+    rot = mathutils.Matrix.Rotation(angle, 3, 'Z')
+    corners = [(-bottom_width, -half_length, bottom_z), (bottom_width, -half_length, bottom_z),
+               (bottom_width, half_length, bottom_z), (-bottom_width, half_length, bottom_z),
+               (-top_width, -half_length, top_z), (top_width, -half_length, top_z),
+               (top_width, half_length, top_z), (-top_width, half_length, top_z)]
+    verts = [bm.verts.new(rot @ mathutils.Vector(co)) for co in corners]
+    for face in ((0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)):
+        bm.faces.new([verts[i] for i in face])
+
+@profiled
+def channelCutout(context, obj, is_large=False, center=None):
+    if useSlab(context, obj):
+        return runOnSlab(context, obj, lambda context, slab: channelCutout(context, slab, is_large, center),
+                         context.scene.ec3d.bevel_depth)
+
+    # channels are centered on the middle of the (already bevelled) bottom
+    if center is None:
+        center = analyzeMesh(obj).bottom_center
+
+    # the cutter is only a boolean operand, so it's never linked into the scene
+    cutter = bpy.data.objects.new("_basetemp_cutter", channelCutterMesh(context, is_large, context.scene.ec3d.bevel_depth))
+    cutter.location = center
+
+    try:
+        with profileStage("channel_boolean", obj):
+            applyBoolean(context, obj, cutter, "_basetemp_channelmod")
+    finally:
+        # the cutter mesh stays cached, only the object goes
+        with profileStage("temp_delete"):
+            removeTempObject(cutter, remove_mesh=False)
+    invalidateAnalysis(obj)
+
     obj.select_set(True)
     context.view_layer.objects.active = obj
 
+@profiled
 def trimBottom(context, obj, remove):
+    if context.scene.ec3d.trim_mode == 'BOOLEAN':
+        if useSlab(context, obj):
+            runOnSlab(context, obj, lambda context, slab: trimBottomBoolean(context, slab, remove), remove)
+            setOriginToGeometry(obj)
+        else:
+            trimBottomBoolean(context, obj, remove)
+    else:
+        trimBottomPlane(obj, remove)
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+def trimBottomPlane(obj, remove):
     bottom_z = bottomZ(obj)
     print("BOTTOM Z IS "+str(bottom_z))
 
-    bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY")
-    bpy.ops.view3d.snap_cursor_to_active()
-    cursor = bpy.context.scene.cursor.location
+    setOriginToGeometry(obj)
 
-    # Create cube to cut bottom flat with
-    cube_size = 200
-    bpy.ops.mesh.primitive_cube_add(size=cube_size, location=(
-        cursor[0], cursor[1], bottom_z - (cube_size/2) + remove ))
-    cut_cube = bpy.context.active_object
-    cut_cube.name = "_basetemp_cutcube"
+    # the cut plane is horizontal in world space, bring it into the mesh's local space
+    mat = obj.matrix_world
+    plane_co = mat.inverted_safe() @ mathutils.Vector((0.0, 0.0, bottom_z + remove))
+    plane_no = (mat.to_3x3().transposed() @ mathutils.Vector((0.0, 0.0, 1.0))).normalized()
 
-    # add modifier
-    obj_cut_mod = "_basetemp_trimmod"
-    bool_cut1 = obj.modifiers.new(type="BOOLEAN", name=obj_cut_mod)
-    bool_cut1.object = cut_cube
-    bool_cut1.operation = 'DIFFERENCE'
+    coords = vertexCoords(obj.data)
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    trimBottomBM(bm, plane_co, plane_no, coords)
+    bm.to_mesh(obj.data)
+    bm.free()
+    obj.data.update()
+    invalidateAnalysis(obj)
+
+def trimBottomBM(bm, plane_co, plane_no, coords=None):
+    # cut everything below the plane away and cap the open loops left along the cut. coords are the vert coords
+    # in bm.verts order, pass them in when they were already read from the mesh with foreach_get
+    if coords is None:
+        coords = np.array([v.co[:] for v in bm.verts], dtype=np.float32).reshape(-1, 3)
+    dist = 0.0001
+
+    # only the verts at or under the plane and what touches them can be cut, so that's all the bisect gets
+    height = (coords - np.array(plane_co, dtype=np.float32)) @ np.array(plane_no, dtype=np.float32)
+    under = np.flatnonzero(height <= dist)
+    if not len(under):
+        return
+    bm.verts.ensure_lookup_table()
+    cut_verts = [bm.verts[i] for i in under]
+    cut_edges = set(e for v in cut_verts for e in v.link_edges)
+    cut_faces = set(f for v in cut_verts for f in v.link_faces)
+    cut = bmesh.ops.bisect_plane(bm, geom=cut_verts + list(cut_edges) + list(cut_faces), dist=dist,
+                                 plane_co=plane_co, plane_no=plane_no, clear_inner=True)
+    cap_edges = [e for e in cut["geom_cut"] if isinstance(e, bmesh.types.BMEdge) and e.is_valid and e.is_boundary]
+    if cap_edges:
+        bmesh.ops.holes_fill(bm, edges=cap_edges, sides=0)
+
+def trimBottomBoolean(context, obj, remove):
+    bottom_z = bottomZ(obj)
+    print("BOTTOM Z IS "+str(bottom_z))
 
-    context.view_layer.objects.active = obj
-    bpy.ops.object.modifier_apply(modifier=obj_cut_mod)
+    setOriginToGeometry(obj)
+    origin = obj.matrix_world.translation
+
+    # cube to cut bottom flat with, an unlinked boolean operand like the channel cutters
+    cut_cube = bpy.data.objects.new("_basetemp_cutcube", trimCubeMesh())
+    cut_cube.location = (origin[0], origin[1], bottom_z - (TRIM_CUBE_SIZE / 2) + remove)
+
+    try:
+        with profileStage("trim_boolean", obj):
+            applyBoolean(context, obj, cut_cube, "_basetemp_trimmod")
+    finally:
+        with profileStage("temp_delete"):
+            removeTempObject(cut_cube, remove_mesh=False)
+    invalidateAnalysis(obj)
+
+def trimCubeMesh():
+    # cached alongside the channel cutters
+    key = ("trim", TRIM_CUBE_SIZE)
+    mesh = bpy.data.meshes.get(_cutter_cache.get(key, ""))
+    if mesh is None:
+        mesh = bpy.data.meshes.new("_basetemp_cutcube")
+        bm = bmesh.new()
+        bmesh.ops.create_cube(bm, size=TRIM_CUBE_SIZE)
+        bm.to_mesh(mesh)
+        bm.free()
+        _cutter_cache[key] = mesh.name
+    return mesh
+
+def applyBoolean(context, obj, operand, name):
+    # bake a DIFFERENCE with operand into obj's mesh
+    modifier = obj.modifiers.new(type="BOOLEAN", name=name)
+    modifier.object = operand
+    modifier.operation = 'DIFFERENCE'
+
+    if len(obj.modifiers) == 1:
+        # read the result straight off the evaluated object, modifier_apply would evaluate the boolean a second time
+        depsgraph = context.evaluated_depsgraph_get()
+        bm = bmesh.new()
+        try:
+            bm.from_object(obj, depsgraph)
+        finally:
+            obj.modifiers.remove(modifier)
+        bm.to_mesh(obj.data)
+        bm.free()
+        obj.data.update()
+    else:
+        # other modifiers would get baked in too, only apply ours
+        context.view_layer.objects.active = obj
+        bpy.ops.object.modifier_apply(modifier=name)
+
+
+
+# ------- SLAB ------
+# the bottom slab_height is split off, worked on alone and welded back onto the untouched top
+SLAB_PROP = "ec3d_slab"
+SLAB_CAP_LAYER = "ec3d_slab_cap"
+SLAB_WELD_DISTANCE = .0001
+SLAB_CAP_RISE = 1
+
+def useSlab(context, obj):
+    return context.scene.ec3d.use_slab and SLAB_PROP not in obj
+
+def slabFaceMask(obj, height):
+    # faces that lie entirely below bottomZ + height (in world Z), from bulk reads of the mesh
+    mesh = obj.data
+    z = vertexZ(obj)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    if not len(loop_start):
+        return np.zeros(0, dtype=bool)
+    return np.maximum.reduceat(z[loop_verts], loop_start) < bottomZ(obj) + height
+
+@profiled
+def runOnSlab(context, obj, fn, reach):
+    # fn(context, slab) works on the slab in place, reach is how far above the bottom it changes anything
+    slab_height = context.scene.ec3d.slab_height
+    in_slab = None
+    if slab_height > reach + BOTTOM_TOLERANCE:
+        in_slab = slabFaceMask(obj, slab_height)
+    else:
+        print("EC3D: slab height %.2f doesn't clear %.2f, running on the whole object" % (slab_height, reach))
+    def wholeObject():
+        obj[SLAB_PROP] = obj.name
+        try:
+            return fn(context, obj)
+        finally:
+            del obj[SLAB_PROP]
+
+    if in_slab is None or in_slab.all() or not in_slab.any():
+        # nothing to gain (or the slab is too short), run on the whole object
+        return wholeObject()
+
+    top = bmesh.new()
+    top.from_mesh(obj.data)
+    top.faces.ensure_lookup_table()
+    slab_faces = [top.faces[i] for i in np.flatnonzero(in_slab)]
+
+    # copy the slab faces out, and cap the hole along the top so the booleans see a closed mesh
+    bm = bmesh.new()
+    cap_layer = bm.faces.layers.int.new(SLAB_CAP_LAYER)
+    verts = {}
+    for face in slab_faces:
+        for v in face.verts:
+            if v not in verts:
+                verts[v] = bm.verts.new(v.co)
+        bm.faces.new([verts[v] for v in face.verts])
+    # wall the jagged open edge up to a flat rim first, filling the jagged loop itself can fold through the slab
+    bm.transform(obj.matrix_world)
+    cap_edges = [e for e in bm.edges if e.is_boundary]
+    if not cap_edges:
+        # the slab is closed shells of its own (a separate base under the figure), there's no seam to work from
+        print("EC3D: the slab of %s has no open edge, running on the whole object" % obj.name)
+        bm.free()
+        top.free()
+        return wholeObject()
+    cap_z = max(v.co.z for e in cap_edges for v in e.verts) + SLAB_CAP_RISE
+    extruded = bmesh.ops.extrude_edge_only(bm, edges=cap_edges)["geom"]
+    for elem in extruded:
+        if isinstance(elem, bmesh.types.BMVert):
+            elem.co.z = cap_z
+        elif isinstance(elem, bmesh.types.BMFace):
+            elem[cap_layer] = 1
+    rim_edges = [e for e in extruded if isinstance(e, bmesh.types.BMEdge) and e.is_boundary]
+    for face in bmesh.ops.holes_fill(bm, edges=rim_edges, sides=0)["faces"]:
+        face[cap_layer] = 1
+    bm.transform(obj.matrix_world.inverted_safe())
+
+    # what's left of the top after the slab comes out is open along the verts it shared with the slab
+    bmesh.ops.delete(top, geom=slab_faces, context='FACES')
+    seam = [v for v in verts if v.is_valid]
+
+    slab = scratchObject(context, "_basetemp_slab", bpy.data.meshes.new("_basetemp_slab"))
+    bm.to_mesh(slab.data)
+    bm.free()
+    slab[SLAB_PROP] = obj.name
+    slab.matrix_world = obj.matrix_world
+    selectOnly(context, slab)
+
+    setScratchVisible(context, True)
+    try:
+        fn(context, slab)
+
+        # back into obj's space (the pipeline may have applied the slab's transform), minus the cap
+        bm = bmesh.new()
+        bm.from_mesh(slab.data)
+        bm.transform(obj.matrix_world.inverted_safe() @ slab.matrix_world)
+        cap_layer = bm.faces.layers.int.get(SLAB_CAP_LAYER)
+        if cap_layer is not None:
+            bmesh.ops.delete(bm, geom=[f for f in bm.faces if f[cap_layer]], context='FACES')
+    finally:
+        setScratchVisible(context, False)
+        removeTempObject(slab)
+
+    # put the slab back into the top, its open edge snaps onto the seam verts the top kept
+    tree = mathutils.kdtree.KDTree(len(seam))
+    for i, v in enumerate(seam):
+        tree.insert(v.co, i)
+    tree.balance()
+
+    vert_map = {}
+    for v in bm.verts:
+        if v.is_boundary:
+            co, i, dist = tree.find(v.co)
+            if i is not None and dist <= SLAB_WELD_DISTANCE:
+                vert_map[v] = seam[i]
+                continue
+        vert_map[v] = top.verts.new(v.co)
+    for face in bm.faces:
+        new_face = top.faces.new([vert_map[v] for v in face.verts])
+        new_face.smooth = face.smooth
+        new_face.material_index = face.material_index
+    bm.free()
+
+    top.to_mesh(obj.data)
+    top.free()
+    obj.data.update()
+    invalidateAnalysis(obj)
 
-    # Finally delete all the temp objects
-    obj.select_set(False)
-    cut_cube.select_set(True)
-    bpy.ops.object.delete()
-    obj.select_set(True)
-    context.view_layer.objects.active = obj
+    selectOnly(context, obj)
+    return obj
+
+# ------- DEDUP ------
+# copies with the same mesh, rotation and scale run the pipeline once, the rest get the result moved over
+def meshHash(mesh):
+    # content hash of the geometry, the same for every copy of a sculpt whatever it's called
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+
+    digest = hashlib.blake2b(vertexCoords(mesh).tobytes(), digest_size=16)
+    digest.update(loop_total.tobytes())
+    digest.update(loop_verts.tobytes())
+    return digest.hexdigest()
+
+def matrixShape(matrix):
+    # the rotation and scale part of a world matrix, rounded so float noise doesn't split copies
+    return tuple(round(v, 5) for row in matrix.to_3x3() for v in row)
+
+def dedupGroups(objects):
+    # groups of copies in first seen order, the first object of each group is the one processed
+    hashes = {}
+    groups = OrderedDict()
+    for obj in objects:
+        if any(modifier.show_viewport for modifier in obj.modifiers):
+            # what comes out of a modifier stack isn't in the hash, so these always get done on their own
+            key = obj.name
+        else:
+            mesh_key = obj.data.as_pointer()
+            if mesh_key not in hashes:
+                hashes[mesh_key] = meshHash(obj.data)
+            key = (hashes[mesh_key], matrixShape(obj.matrix_world))
+        groups.setdefault(key, []).append(obj)
+    return list(groups.values())
+
+def instanceResult(source, source_matrix, result, copies):
+    # gives each copy the result for source, moved by its offset from source. Old meshes are left to the caller
+    instances = []
+    for obj in copies:
+        offset = mathutils.Matrix.Translation(obj.matrix_world.translation - source_matrix.translation)
+        if result is source:
+            obj.data = result.data
+            obj.matrix_world = offset @ result.matrix_world
+            instances.append(obj)
+            continue
+
+        instance = result.copy()
+        for collection in result.users_collection:
+            collection.objects.link(instance)
+        instance.matrix_world = offset @ result.matrix_world
+        if result.name.startswith(source.name):
+            instance.name = obj.name + result.name[len(source.name):]
+        instances.append(instance)
+    return instances
+
+# ------- PREFLIGHT ------
+# holes, non-manifold edges, unflat bottoms and thin walls, cached by mesh hash + rotation and scale
+class Preflight:
+    def __init__(self, mesh, matrix):
+        loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("edge_index", loop_edges)
+        faces_per_edge = np.bincount(loop_edges, minlength=len(mesh.edges))
+        self.boundary_edges = int(np.count_nonzero(faces_per_edge == 1))
+        # loose edges are no more printable than edges with 3+ faces
+        self.nonmanifold_edges = int(np.count_nonzero((faces_per_edge == 0) | (faces_per_edge > 2)))
+
+        mesh.calc_loop_triangles()
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        tris = tris.reshape(-1, 3)
+        mat = np.array(matrix, dtype=np.float64)
+        if np.linalg.det(mat[:3, :3]) < 0:
+            tris = tris[:, ::-1]
+        coords = vertexCoords(mesh) @ mat[:3, :3].T + mat[:3, 3]
+        corners = coords[tris]
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        areas = np.linalg.norm(normals, axis=1) / 2
+
+        # downward faces near the bottom are the bottom, flat where they sit exactly on bottomZ (single precision)
+        z = coords[:, 2].astype(np.float32)
+        face_top = z[tris].max(axis=1) if len(tris) else np.empty(0, dtype=np.float32)
+        bottom_z = z.min() if len(z) else 0.0
+        bottom = (normals[:, 2] < 0) & (face_top <= bottom_z + BOTTOM_TOLERANCE)
+        bottom_area = areas[bottom].sum()
+        self.flat_bottom = float(areas[bottom & (face_top == bottom_z)].sum() / bottom_area) if bottom_area else 0.0
+
+        self.thin_faces, self.wall_samples = thinWalls(mesh, matrix, corners, normals, areas)
+
+    def problems(self):
+        problems = []
+        if self.boundary_edges:
+            problems.append("%d open edges" % self.boundary_edges)
+        if self.nonmanifold_edges:
+            problems.append("%d non-manifold edges" % self.nonmanifold_edges)
+        if self.flat_bottom < PREFLIGHT_FLAT_SHARE:
+            problems.append("bottom %.0f%% flat" % (self.flat_bottom * 100))
+        if self.thin_faces:
+            problems.append("%d of %d faces thinner than %smm" % (self.thin_faces, self.wall_samples, PREFLIGHT_MIN_WALL))
+        return problems
+
+def thinWalls(mesh, matrix, corners, normals, areas):
+    # returns (thin faces, faces sampled), a ray goes in from each sampled face and exits within PREFLIGHT_MIN_WALL
+    sample = np.flatnonzero(areas > 0)
+    if len(sample) > PREFLIGHT_WALL_SAMPLES:
+        sample = sample[np.linspace(0, len(sample) - 1, PREFLIGHT_WALL_SAMPLES).astype(np.int64)]
+    if not len(sample):
+        return 0, 0
+
+    inward = -normals[sample] / (areas[sample, None] * 2)
+    origins = corners[sample].mean(axis=1) + inward * PREFLIGHT_RAY_OFFSET
+    # built from a world space bmesh, which stays in C rather than going through python lists
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.transform(matrix)
+    if matrix.is_negative:
+        bmesh.ops.reverse_faces(bm, faces=bm.faces[:])
+    tree = mathutils.bvhtree.BVHTree.FromBMesh(bm)
+    bm.free()
+    thin = 0
+    for origin, direction in zip(origins.tolist(), inward.tolist()):
+        hit, hit_normal, index, distance = tree.ray_cast(origin, direction, PREFLIGHT_MIN_WALL)
+        # leaving through the back of a face is the other side of the wall, anything else is a hole or noise
+        if hit is not None and hit_normal.dot(direction) > 0:
+            thin += 1
+    return thin, len(sample)
+
+_preflight_cache = OrderedDict()
+# (object name, Preflight) from the last check, for the panel
+_preflight_results = []
+
+@profiled
+def preflightCheck(obj, depsgraph):
+    # checks the evaluated mesh, which is what gets exported
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        key = (meshHash(mesh), matrixShape(eval_obj.matrix_world))
+        result = _preflight_cache.get(key)
+        if result is None:
+            result = _preflight_cache[key] = Preflight(mesh, eval_obj.matrix_world)
+    finally:
+        eval_obj.to_mesh_clear()
+    _preflight_cache.move_to_end(key)
+    while len(_preflight_cache) > PREFLIGHT_CACHE_SIZE:
+        _preflight_cache.popitem(last=False)
+    return result
+
+def preflightObjects(context, objects):
+    # returns how many objects have problems, the results are kept for the panel
+    depsgraph = context.evaluated_depsgraph_get()
+    _preflight_results[:] = [(obj.name, preflightCheck(obj, depsgraph)) for obj in objects if obj.type == 'MESH']
+    return sum(1 for name, result in _preflight_results if result.problems())
+
+def preflightWarnings():
+    return ["%s: %s" % (name, ", ".join(result.problems())) for name, result in _preflight_results if result.problems()]
+
+# ------- PIPELINES ------
+# run on the active object, return the result (a new duplicate for bevels, the same object for fix/trim)
+def pipelineFixBottom(context, obj):
+    fixBottom(obj)
+    return obj
+
+def pipelineTrimSmall(context, obj):
+    trimBottom(context, obj, BOTTOM_TRIM_VALUE_SHORT)
+    return obj
+
+def pipelineTrimLarge(context, obj):
+    trimBottom(context, obj, BOTTOM_TRIM_VALUE_TALL)
+    return obj
+
+def pipelineSimpleBevel(context, obj):
+    return basicBevel(context, obj)
+
+def pipelineSimpleBevelAdditive(context, obj):
+    return basicBevel(context, obj, additive=True)
+
+def pipelineSmallChannelBevel(context, obj):
+    new_obj = basicBevel(context, obj)
+    channelCutout(context, new_obj, is_large=False)
+    return new_obj
+
+def pipelineSmallChannelBevelAdditive(context, obj):
+    new_obj = basicBevel(context, obj, additive=True)
+    channelCutout(context, new_obj, is_large=False)
+    return new_obj
+
+def pipelineLargeChannelBevel(context, obj):
+    new_obj = basicBevel(context, obj)
+    channelCutout(context, new_obj, is_large=True)
+    return new_obj
 
+def pipelineLargeChannelBevelAdditive(context, obj):
+    new_obj = basicBevel(context, obj, additive=True)
+    channelCutout(context, new_obj, is_large=True)
+    return new_obj
+
+PIPELINES = OrderedDict((
+    ('bevel_simple', ("Simple Bevel", pipelineSimpleBevel)),
+    ('bevel_simple_additive', ("Simple Bevel (Additive)", pipelineSimpleBevelAdditive)),
+    ('bevel_fancy_small', ("Channeled Bevel (1 inch)", pipelineSmallChannelBevel)),
+    ('bevel_fancy_small_additive', ("Channeled Bevel (1 inch, Additive)", pipelineSmallChannelBevelAdditive)),
+    ('bevel_fancy_large', ("Channeled Bevel (2+ inch)", pipelineLargeChannelBevel)),
+    ('bevel_fancy_large_additive', ("Channeled Bevel (2+ inch, Additive)", pipelineLargeChannelBevelAdditive)),
+    ('fix_bottom', ("Fix bottom", pipelineFixBottom)),
+    ('trim_bottom_small', ("Trim bottom (small)", pipelineTrimSmall)),
+    ('trim_bottom_large', ("Trim bottom (large)", pipelineTrimLarge)),
+))
+
+# pipelines that change the object they're given rather than making a new one
+IN_PLACE_PIPELINES = {'fix_bottom', 'trim_bottom_small', 'trim_bottom_large'}
+
+def pipelineItems(self, context):
+    return [(key, label, "") for key, (label, fn) in PIPELINES.items()]
+
+def removeNewObjects(existing):
+    # a pipeline that fails half way can leave its duplicate and cutters behind
+    for obj in [o for o in bpy.data.objects if o not in existing]:
+        removeTempObject(obj)
+    purgeTemp()
+
+def batchObjects(context):
+    settings = context.scene.ec3d
+    if settings.batch_source == 'COLLECTION':
+        if not settings.batch_collection:
+            return []
+        objects = settings.batch_collection.all_objects
+    else:
+        objects = context.selected_objects
+    return [obj for obj in objects if obj.type == 'MESH']
+
+def batchProcess(context, objects, pipeline, dedup=False, memory_budget=0):
+    # runs a pipeline over many objects, one failure doesn't stop the rest of the batch
+    return runSteps(context, batchSteps(objects, pipeline, dedup=dedup, memory_budget=memory_budget), len(objects))
+
+def batchSteps(objects, pipeline, rollback=False, dedup=False, memory_budget=0):
+    # batchProcess as a step generator (see runSteps), with rollback closing it part way puts everything back
+    fn = PIPELINES[pipeline][1]
+    in_place = pipeline in IN_PLACE_PIPELINES
+    groups = dedupGroups(objects) if dedup else [[obj] for obj in objects]
+    results = []
+    failures = []
+    existing = set(bpy.data.objects)
+    backups = []
+    # meshes the copies had before they were handed the result
+    replaced = []
+    low_memory = False
+
+    start = time.perf_counter()
+    done = 0
+    try:
+        for group in groups:
+            context = yield done
+            done += len(group)
+            obj = group[0]
+            before = set(bpy.data.objects)
+            if rollback and in_place:
+                backups.append((obj, obj.data, obj.data.copy(), obj.matrix_world.copy()))
+                # the copies' meshes are never edited, only swapped out
+                backups.extend((copy, copy.data, None, copy.matrix_world.copy()) for copy in group[1:])
+            source_matrix = obj.matrix_world.copy()
+            try:
+                if context.object and context.object.mode != 'OBJECT':
+                    bpy.ops.object.mode_set(mode='OBJECT')
+                selectOnly(context, obj)
+                result = fn(context, obj)
+            except Exception as e:
+                failures.extend((copy.name, str(e)) for copy in group)
+                print("EC3D batch: %s failed on %s: %s" % (pipeline, obj.name, e))
+                removeNewObjects(before)
+                continue
+
+            results.append(result)
+            replaced.extend(copy.data for copy in group[1:] if result is obj)
+            results.extend(instanceResult(obj, source_matrix, result, group[1:]))
+
+            if not low_memory and overMemoryBudget(memory_budget):
+                low_memory = True
+                print("EC3D batch: over the %d MB memory budget, freeing memory after every object" % memory_budget)
+            if low_memory:
+                # everything so far is kept from here on, so the backups can go
+                for backup in backups:
+                    if backup[2] is not None:
+                        bpy.data.meshes.remove(backup[2])
+                backups = []
+                existing = set(bpy.data.objects)
+                removeUnusedMeshes(replaced)
+                replaced = []
+                freeMemory()
+        context = yield len(objects)
+    except GeneratorExit:
+        removeNewObjects(existing)
+        # oldest first is last, so a mesh shared by several objects ends up as it was before any of them ran
+        for obj, mesh, backup, matrix in reversed(backups):
+            obj.data = mesh
+            if backup is not None:
+                restoreMesh(mesh, backup)
+            obj.matrix_world = matrix
+            invalidateAnalysis(obj)
+        raise
+    finally:
+        for obj, mesh, backup, matrix in backups:
+            if backup is not None:
+                bpy.data.meshes.remove(backup)
+        purgeTemp()
+    removeUnusedMeshes(replaced)
+    elapsed = time.perf_counter() - start
+
+    # leave the results selected, the same as running the operators one at a time would
+    if context.object and context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in results:
+        obj.select_set(True)
+    if results:
+        context.view_layer.objects.active = results[-1]
 
+    rate = len(objects) / elapsed if elapsed > 0 else 0.0
+    print("EC3D batch: %s on %d objects (%d unique) in %.2fs (%.2f objects/sec), %d failed" % (
+        pipeline, len(objects), len(groups), elapsed, rate, len(failures)))
+
+    return results, failures, elapsed
+
+def restoreMesh(mesh, backup):
+    # copies backup's geometry into mesh, so everything using mesh sees it
+    bm = bmesh.new()
+    bm.from_mesh(backup)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
+# ------- PREVIEW ------
+# bevels are tried on a cached proxy of the bottom, then applied once to the real thing
+PREVIEW_SOURCE_PROP = "ec3d_preview_source"
+PREVIEW_PIPELINE_PROP = "ec3d_preview_pipeline"
+
+_preview_cache = {}
+
+def previewPipelineItems(self, context):
+    # only the bevels make a new object, so only they can be previewed side by side
+    return [(key, label, "") for key, (label, fn) in PIPELINES.items() if key.startswith("bevel_")]
+
+def previewProxyMesh(context, obj):
+    fingerprint = meshFingerprint(obj)
+    cached = _preview_cache.get(obj.name)
+    if cached and cached[0] == fingerprint:
+        mesh = bpy.data.meshes.get(cached[1])
+        if mesh is not None:
+            return mesh
+
+    if cached and cached[1] in bpy.data.meshes:
+        bpy.data.meshes.remove(bpy.data.meshes[cached[1]])
+
+    # world space slab of the bottom of the model, capped so the booleans still see a closed mesh
+    bottom_z = bottomZ(obj)
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    bm.transform(obj.matrix_world)
+    cut = bmesh.ops.bisect_plane(bm, geom=bm.verts[:] + bm.edges[:] + bm.faces[:], dist=0.0001,
+                                 plane_co=(0.0, 0.0, bottom_z + PREVIEW_BAND_HEIGHT), plane_no=(0.0, 0.0, 1.0),
+                                 clear_outer=True)
+    cap_edges = [e for e in cut["geom_cut"] if isinstance(e, bmesh.types.BMEdge) and e.is_valid and e.is_boundary]
+    if cap_edges:
+        bmesh.ops.holes_fill(bm, edges=cap_edges, sides=0)
+    # flatten the bottom first and keep the decimate off it, so the bevel inset gets a clean outline
+    bottom_z = fixBottomBM(bm, bottom_z)[1]
+
+    mesh = bpy.data.meshes.new("_basetemp_preview")
+    bm.to_mesh(mesh)
+    bm.free()
+
+    if len(mesh.polygons) > PREVIEW_MAX_FACES:
+        mesh = decimatedMesh(context, mesh, PREVIEW_MAX_FACES / len(mesh.polygons), bottom_z + BOTTOM_TOLERANCE)
+
+    _preview_cache[obj.name] = (fingerprint, mesh.name)
+    return mesh
+
+def decimatedMesh(context, mesh, ratio, keep_below=None):
+    # collapse decimate through a temp object, the source mesh is removed. Verts under keep_below are left alone
+    temp = scratchObject(context, "_basetemp_decimate", mesh)
+    decimate = temp.modifiers.new(type="DECIMATE", name="_basetemp_decimatemod")
+    decimate.ratio = ratio
+    if keep_below is not None:
+        # collapse only touches verts in the group
+        z = vertexCoords(mesh)[:, 2]
+        group = temp.vertex_groups.new(name="_basetemp_decimate")
+        group.add(np.flatnonzero(z >= keep_below).tolist(), 1.0, 'REPLACE')
+        decimate.vertex_group = group.name
+    depsgraph = context.evaluated_depsgraph_get()
+    decimated = bpy.data.meshes.new_from_object(temp.evaluated_get(depsgraph))
+    decimated.name = mesh.name
+    removeTempObject(temp)
+    return decimated
+
+def findPreviews():
+    return [obj for obj in bpy.data.objects if PREVIEW_SOURCE_PROP in obj]
+
+def clearPreviews():
+    for obj in findPreviews():
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+def previewBevel(context, obj, pipeline):
+    # runs the pipeline on a copy of the cached proxy, the result is left beside obj and obj stays selected
+    clearPreviews()
+    proxy = bpy.data.objects.new(obj.name + " [preview]", previewProxyMesh(context, obj).copy())
+    context.scene.collection.objects.link(proxy)
+    selectOnly(context, proxy)
+
+    existing = set(bpy.data.objects)
+    try:
+        preview = PIPELINES[pipeline][1](context, proxy)
+    except Exception:
+        removeNewObjects(existing)
+        raise
+    finally:
+        mesh = proxy.data
+        bpy.data.objects.remove(proxy)
+        bpy.data.meshes.remove(mesh)
+
+    preview.name = obj.name + " [preview]"
+    preview[PREVIEW_SOURCE_PROP] = obj.name
+    preview[PREVIEW_PIPELINE_PROP] = pipeline
+    selectOnly(context, obj)
+    return preview
+
+def applyPreviews(context):
+    # replay each previewed pipeline on its full resolution source with the current settings
+    results = []
+    for preview in findPreviews():
+        source = bpy.data.objects.get(preview[PREVIEW_SOURCE_PROP])
+        pipeline = preview[PREVIEW_PIPELINE_PROP]
+        mesh = preview.data
+        bpy.data.objects.remove(preview)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+        if source is None or pipeline not in PIPELINES:
+            continue
+
+        selectOnly(context, source)
+        results.append(PIPELINES[pipeline][1](context, source))
+    return results
+
+# ------- PLATE ------
+# skyline packing of bottom bounding boxes onto build plates, one STL per plate
+PLATE_PROP = "ec3d_plate"
+
+def plateFootprint(obj):
+    # (min xy, max xy, bottom z) of the verts within BOTTOM_TOLERANCE of the bottom, in world space
+    mat = np.array(obj.matrix_world, dtype=np.float64)
+    world = vertexCoords(obj.data) @ mat[:3, :3].T + mat[:3, 3]
+    bottom_z = world[:, 2].min()
+    bottom = world[world[:, 2] < bottom_z + BOTTOM_TOLERANCE, :2]
+    return bottom.min(axis=0), bottom.max(axis=0), bottom_z
+
+def packRects(sizes, width, depth, rotate=True):
+    # packs (w, h) rects onto plates, returns (plate, x, y, rotated) per rect or None if it can't fit
+    placements = [None] * len(sizes)
+    plates = []
+    for i in sorted(range(len(sizes)), key=lambda i: max(sizes[i]), reverse=True):
+        w, h = sizes[i]
+        for plate, skyline in enumerate(plates + [[(0.0, 0.0, width)]]):
+            spot = skylineSpot(skyline, w, h, width, depth, rotate)
+            if spot:
+                break
+        else:
+            continue
+        if plate == len(plates):
+            plates.append(skyline)
+
+        x, y, rotated = spot
+        if rotated:
+            w, h = h, w
+        skylineAdd(skyline, x, y + h, w)
+        placements[i] = (plate, x, y, rotated)
+    return placements
+
+def skylineSpot(skyline, w, h, width, depth, rotate=True):
+    # lowest (then leftmost) spot for a w x h rect on the skyline, which is (x, y, width) segments left to right
+    best = None
+    for rw, rh, rotated in ((w, h, False), (h, w, True)) if rotate else ((w, h, False),):
+        for i, (x, _, _) in enumerate(skyline):
+            if x + rw > width + 1e-6:
+                break
+            # the rect rests on the highest segment under it
+            y = 0.0
+            for sx, sy, sw in skyline[i:]:
+                if sx >= x + rw - 1e-6:
+                    break
+                y = max(y, sy)
+            if y + rh <= depth + 1e-6 and (best is None or (y + rh, x) < best[0]):
+                best = ((y + rh, x), (x, y, rotated))
+    return best and best[1]
+
+def skylineAdd(skyline, x, top, w):
+    # raise the skyline to top between x and x + w
+    end = x + w
+    segments = [(x, top, w)]
+    for sx, sy, sw in skyline:
+        if sx + sw <= x or sx >= end:
+            segments.append((sx, sy, sw))
+            continue
+        if sx < x:
+            segments.append((sx, sy, x - sx))
+        if sx + sw > end:
+            segments.append((end, sy, sx + sw - end))
+    segments.sort()
+
+    # neighbours at the same height are one segment
+    skyline[:] = segments[:1]
+    for sx, sy, sw in segments[1:]:
+        px, py, pw = skyline[-1]
+        if sy == py:
+            skyline[-1] = (px, py, pw + sw)
+        else:
+            skyline.append((sx, sy, sw))
+
+@profiled
+def packPlate(objects, width, depth, spacing, rotate=True):
+    # moves the objects onto plates at z 0, returns (plates used, objects that don't fit)
+    footprints = [plateFootprint(obj) for obj in objects]
+    # every box gets the spacing added, and so does the plate so the last box in a row can still touch its edge
+    sizes = [tuple(hi - lo + spacing) for lo, hi, bottom_z in footprints]
+    placements = packRects(sizes, width + spacing, depth + spacing, rotate)
+
+    plates = 0
+    skipped = []
+    for obj, (lo, hi, bottom_z), placement in zip(objects, footprints, placements):
+        if placement is None:
+            if PLATE_PROP in obj:
+                del obj[PLATE_PROP]
+            skipped.append(obj)
+            continue
+
+        plate, x, y, rotated = placement
+        plates = max(plates, plate + 1)
+        w, h = hi - lo
+        if rotated:
+            w, h = h, w
+        # the middle of the footprint goes to the middle of its spot, turned around itself so it still fits
+        center = mathutils.Vector(((lo[0] + hi[0]) / 2, (lo[1] + hi[1]) / 2, bottom_z))
+        target = mathutils.Vector((plate * (width + PLATE_GAP) - width / 2 + x + w / 2, y + h / 2 - depth / 2, 0.0))
+        turn = mathutils.Matrix.Rotation(math.pi / 2 if rotated else 0.0, 4, 'Z')
+        obj.matrix_world = mathutils.Matrix.Translation(target) @ turn @ mathutils.Matrix.Translation(-center) @ \
+            obj.matrix_world
+        obj[PLATE_PROP] = plate
+    return plates, skipped
+
+def platePaths(filepath, objects):
+    # [(filepath, objects)] per plate, _2, _3.. after the first. Objects that aren't on a plate are left out
+    plates = {}
+    for obj in objects:
+        if PLATE_PROP in obj:
+            plates.setdefault(obj[PLATE_PROP], []).append(obj)
+    stem, ext = os.path.splitext(filepath)
+    return [(filepath if i == 0 else "%s_%d%s" % (stem, i + 1, ext), plates[plate])
+            for i, plate in enumerate(sorted(plates))]
+
+def plateSteps(plates):
+    # step generator writing one STL per plate, the triangle count is patched into the header at the end
+    start = time.perf_counter()
+    parts = []
+    written = 0
+    done = 0
+    try:
+        for filepath, objects in plates:
+            parts.append(filepath + EXPORT_PART_SUFFIX)
+            count = 0
+            with open(parts[-1], "wb") as f:
+                f.write(stlHeader(0))
+                for obj in objects:
+                    context = yield done
+                    tris = meshTriangles(obj, context.evaluated_depsgraph_get())
+                    stlRecords(tris).tofile(f)
+                    count += len(tris)
+                    done += 1
+                f.seek(80)
+                f.write(np.uint32(count).tobytes())
+            written += 84 + STL_RECORD.itemsize * count
+        yield done
+    except BaseException:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+        raise
+
+    for (filepath, objects), part in zip(plates, parts):
+        os.replace(part, filepath)
+    return ExportStats(len(plates), written, time.perf_counter() - start)
+
+def exportPlates(context, filepath, objects):
+    plates = platePaths(filepath, objects)
+    return runSteps(context, plateSteps(plates), len(objects))
+
+# ------- MODAL ------
+# step generators do one object per step, runSteps runs them straight through and ModalSteps off a timer
+def runSteps(context, steps, total):
+    wm = context.window_manager
+    wm.progress_begin(0, total)
+    try:
+        next(steps)
+        while True:
+            wm.progress_update(steps.send(context))
+    except StopIteration as done:
+        return done.value
+    finally:
+        wm.progress_end()
+
+class ModalSteps:
+    # operator mixin, return startSteps() from invoke/execute and implement finishSteps(context, result)
+    _steps = None
+    _timer = None
+
+    def startSteps(self, context, label, steps, total):
+        self._label = label
+        self._steps = steps
+        self._total = total
+        next(steps)
+
+        wm = context.window_manager
+        wm.progress_begin(0, total)
+        self._timer = wm.event_timer_add(MODAL_TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        self.showProgress(context, 0)
+        return {'RUNNING_MODAL'}
+
+    def stopSteps(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def showProgress(self, context, done):
+        context.window_manager.progress_update(done)
+        context.workspace.status_text_set("%s: %d of %d done, Esc to cancel" % (self._label, done, self._total))
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.stopSteps(context)
+            self._steps.close()
+            self.report({"WARNING"}, "%s cancelled, changes rolled back" % self._label)
+            return {'CANCELLED'}
+        if event.type in {'Z', 'Y'} and (event.ctrl or event.oskey):
+            # undo mid-run would free data the steps still hold, Esc backs out instead
+            return {'RUNNING_MODAL'}
+        if event.type != 'TIMER':
+            # keep the viewport usable while it runs
+            return {'PASS_THROUGH'}
+
+        deadline = time.perf_counter() + MODAL_STEP_SECONDS
+        try:
+            done = self._steps.send(context)
+            while time.perf_counter() < deadline:
+                done = self._steps.send(context)
+        except StopIteration as finished:
+            self.stopSteps(context)
+            return self.finishSteps(context, finished.value)
+        except Exception:
+            self.stopSteps(context)
+            raise
+        self.showProgress(context, done)
+        return {'RUNNING_MODAL'}
 
 # ------- OPERATORS ------
+class OP_BatchProcess(ModalSteps, bpy.types.Operator):
+    bl_idname = "ec3d_bases.batch_process"
+    bl_label = "Batch Process"
+    bl_description = "Run the chosen base operation on every selected object, or every mesh in a collection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def invoke(self, context, event):
+        objects = batchObjects(context)
+        if not objects:
+            self.report({"WARNING"}, "No objects to process")
+            return {"CANCELLED"}
+        settings = context.scene.ec3d
+        steps = batchSteps(objects, settings.batch_pipeline, rollback=True, dedup=settings.use_dedup,
+                           memory_budget=settings.memory_budget)
+        return self.startSteps(context, "Batch", steps, len(objects))
+
+    def execute(self, context):
+        objects = batchObjects(context)
+        if not objects:
+            self.report({"WARNING"}, "No objects to process")
+            return {"CANCELLED"}
+        settings = context.scene.ec3d
+        return self.finishSteps(context, batchProcess(context, objects, settings.batch_pipeline, settings.use_dedup,
+                                                      settings.memory_budget))
+
+    def finishSteps(self, context, result):
+        results, failures, elapsed = result
+        for name, error in failures:
+            self.report({"WARNING"}, "%s failed: %s" % (name, error))
+
+        count = len(results) + len(failures)
+        peak = peakMemoryMB()
+        self.report({"INFO"}, "%s objects processed in %.1fs (%.2f/sec), %s failed%s" % (
+            count, elapsed, count / elapsed if elapsed > 0 else 0.0, len(failures),
+            ", peak memory %.0f MB" % peak if peak is not None else ""))
+        return {'FINISHED'}
+
+
+class OP_PreviewBevel(bpy.types.Operator):
+    bl_idname = "ec3d_bases.preview_bevel"
+    bl_label = "Preview Bevel"
+    bl_description = "Try the bevel on a low poly copy of the bottom of the selected object"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        if len(context.selected_objects) != 1 or context.view_layer.objects.active.type != 'MESH':
+            self.report({"WARNING"}, "No object selected")
+            return {"CANCELLED"}
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        start = time.perf_counter()
+        previewBevel(context, context.view_layer.objects.active, context.scene.ec3d.preview_pipeline)
+        self.report({"INFO"}, "Preview in %.2fs" % (time.perf_counter() - start))
+        return {'FINISHED'}
+
+class OP_PreviewApply(bpy.types.Operator):
+    bl_idname = "ec3d_bases.preview_apply"
+    bl_label = "Apply Preview"
+    bl_description = "Remove the preview and run the same bevel on the full object"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(findPreviews())
+
+    def execute(self, context):
+        if context.object and context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        results = applyPreviews(context)
+        for obj in results:
+            obj.select_set(True)
+        return {'FINISHED'}
+
+class OP_PreviewClear(bpy.types.Operator):
+    bl_idname = "ec3d_bases.preview_clear"
+    bl_label = "Clear Preview"
+    bl_description = "Remove the preview"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(findPreviews())
+
+    def execute(self, context):
+        clearPreviews()
+        return {'FINISHED'}
+
+class OP_ProfileDump(bpy.types.Operator, ExportHelper):
+    bl_idname = "ec3d_bases.profile_dump"
+    bl_label = "Save Profile"
+    bl_description = "Save the recorded stage timings, as CSV if the file name ends in .csv, otherwise JSON"
+    bl_options = {'REGISTER'}
+    filename_ext = ".json"
+    # let a typed .csv through instead of forcing .json onto it
+    check_extension = False
+
+    filter_glob: bpy.props.StringProperty(
+        default="*.json;*.csv",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bool(_profile_records)
+
+    def execute(self, context):
+        count = writeProfile(self.filepath)
+        self.report({"INFO"}, "Saved %s profile records to %s" % (count, self.filepath))
+        return {'FINISHED'}
+
+class OP_ProfileClear(bpy.types.Operator):
+    bl_idname = "ec3d_bases.profile_clear"
+    bl_label = "Clear Profile"
+    bl_description = "Forget the recorded stage timings"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        clearProfile()
+        return {'FINISHED'}
 
-class OP_ExportRepeat(bpy.types.Operator):
+class OP_Preflight(bpy.types.Operator):
+    bl_idname = "ec3d_bases.preflight"
+    bl_label = "Preflight Check"
+    bl_description = "Check the selected objects for holes, non-manifold edges, an uneven bottom and thin walls"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        if not context.selected_objects:
+            self.report({"WARNING"}, "No objects selected")
+            return {"CANCELLED"}
+
+        flagged = preflightObjects(context, context.selected_objects)
+        for warning in preflightWarnings():
+            self.report({"WARNING"}, warning)
+        self.report({"INFO"}, "%s of %s objects failed preflight" % (flagged, len(_preflight_results)))
+        return {'FINISHED'}
+
+class OP_ExportRepeat(ModalSteps, bpy.types.Operator):
     bl_idname = "ec3d_bases.export_repeat"
     bl_label = "Export Again"
-    bl_description = "Repeat export to last destination"
+    bl_description = "Repeat export to last destination, only rewriting objects that changed"
     bl_options = {'REGISTER'}
 
+    def invoke(self, context, event):
+        save_to = exportFolder(context, context.scene.ec3d.export_path)
+        objects = meshObjects(context.selected_objects)
+        settings = context.scene.ec3d
+        steps = exportSteps(objects, save_to, incremental=True, dedup=settings.use_dedup,
+                            preflight=settings.use_preflight, export_format=settings.export_format, manifest=True)
+        return self.startSteps(context, "Export", steps, len(objects))
+
     def execute(self, context):
-        cnt = exportToFolder(context, context.scene.ec3d.export_path)
-        self.report({"INFO"}, "%s files exported!" % cnt)
+        settings = context.scene.ec3d
+        return self.finishSteps(context, exportToFolder(context, settings.export_path, incremental=True,
+                                                        dedup=settings.use_dedup, preflight=settings.use_preflight,
+                                                        export_format=settings.export_format))
+
+    def finishSteps(self, context, stats):
+        if stats.flagged:
+            for warning in preflightWarnings():
+                self.report({"WARNING"}, warning)
+        self.report({"INFO"}, stats.summary())
         return {'FINISHED'}
 
-class OP_ExportToSTL(bpy.types.Operator, ExportHelper):
+class OP_ExportToSTL(ModalSteps, bpy.types.Operator, ExportHelper):
     bl_idname = "ec3d_bases.export_to_stl"
     bl_label = "Export Here"
-    bl_description = "Export selected object to STL file"
+    bl_description = "Export selected objects, one file each in the chosen format"
     bl_options = {'REGISTER'}
     filename_ext = ".stl"
 
@@ -398,10 +2332,97 @@ class OP_ExportToSTL(bpy.types.Operator, ExportHelper):
         options={'HIDDEN'},
         maxlen=255,  # Max internal buffer length, longer would be clamped.
     )
+    # set when run from the UI, the file browser calls execute either way
+    run_modal: bpy.props.BoolProperty(
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'},
+    )
+
+    def invoke(self, context, event):
+        self.run_modal = True
+        # the file browser suggests and filters on the chosen format's extension
+        self.filename_ext = EXPORT_FORMATS[context.scene.ec3d.export_format][1]
+        self.filter_glob = "*" + self.filename_ext
+        return ExportHelper.invoke(self, context, event)
+
+    def execute(self, context):
+        settings = context.scene.ec3d
+        if not self.run_modal:
+            return self.finishSteps(context, exportToFolder(context, self.filepath, dedup=settings.use_dedup,
+                                                            preflight=settings.use_preflight,
+                                                            export_format=settings.export_format))
+        save_to = exportFolder(context, self.filepath)
+        objects = meshObjects(context.selected_objects)
+        steps = exportSteps(objects, save_to, dedup=settings.use_dedup, preflight=settings.use_preflight,
+                            export_format=settings.export_format, manifest=True)
+        return self.startSteps(context, "Export", steps, len(objects))
+
+    def finishSteps(self, context, stats):
+        if stats.flagged:
+            for warning in preflightWarnings():
+                self.report({"WARNING"}, warning)
+        self.report({"INFO"}, stats.summary())
+        return {'FINISHED'}
+
+class OP_PackPlate(bpy.types.Operator):
+    bl_idname = "ec3d_bases.pack_plate"
+    bl_label = "Pack Plate"
+    bl_description = "Lay the selected bases out on the build plate, starting another plate if they don't all fit"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH' and len(obj.data.vertices)]
+        if not objects:
+            self.report({"WARNING"}, "No objects selected")
+            return {"CANCELLED"}
+
+        settings = context.scene.ec3d
+        plates, skipped = packPlate(objects, settings.plate_width, settings.plate_depth, settings.plate_spacing,
+                                    settings.plate_rotate)
+        for obj in skipped:
+            self.report({"WARNING"}, "%s doesn't fit on the plate" % obj.name)
+        self.report({"INFO"}, "%s objects packed on %s plate(s)" % (len(objects) - len(skipped), plates))
+        return {'FINISHED'}
+
+class OP_ExportPlate(ModalSteps, bpy.types.Operator, ExportHelper):
+    bl_idname = "ec3d_bases.export_plate"
+    bl_label = "Export Plate"
+    bl_description = "Export the selected objects as one STL file per plate"
+    bl_options = {'REGISTER'}
+    filename_ext = ".stl"
+
+    filter_glob: bpy.props.StringProperty(
+        default="*.stl",
+        options={'HIDDEN'},
+        maxlen=255,
+    )
+    # set when run from the UI, the file browser calls execute either way
+    run_modal: bpy.props.BoolProperty(
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'},
+    )
+
+    def invoke(self, context, event):
+        self.run_modal = True
+        return ExportHelper.invoke(self, context, event)
 
     def execute(self, context):
-        cnt = exportToFolder(context, self.filepath)
-        self.report({"INFO"}, "%s files exported!" % cnt)
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not objects:
+            self.report({"WARNING"}, "No objects selected")
+            return {"CANCELLED"}
+        for obj in objects:
+            if PLATE_PROP not in obj:
+                self.report({"WARNING"}, "%s isn't on a plate, leaving it out" % obj.name)
+        objects = [obj for obj in objects if PLATE_PROP in obj]
+        if not objects:
+            return {"CANCELLED"}
+        if not self.run_modal:
+            return self.finishSteps(context, exportPlates(context, self.filepath, objects))
+        return self.startSteps(context, "Plate export", plateSteps(platePaths(self.filepath, objects)), len(objects))
+
+    def finishSteps(self, context, stats):
+        self.report({"INFO"}, stats.summary())
         return {'FINISHED'}
 
 class OP_FixBottom(bpy.types.Operator):
@@ -473,7 +2494,7 @@ class OP_SimpleBevel(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context)
+        obj = basicBevel(context, context.view_layer.objects.active)
 
         self.report({"INFO"}, 'Simple base bevel added, new model added as ' + obj.name)
         return {'FINISHED'}
@@ -489,7 +2510,7 @@ class OP_SimpleBevelAdditive(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context, additive=True)
+        obj = basicBevel(context, context.view_layer.objects.active, additive=True)
 
         self.report({"INFO"}, 'Simple base bevel added, new model added as ' + obj.name)
         return {'FINISHED'}
@@ -505,7 +2526,7 @@ class OP_SmallFancyBevel(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context)
+        obj = basicBevel(context, context.view_layer.objects.active)
 
         channelCutout(context, obj)
 
@@ -523,7 +2544,7 @@ class OP_SmallFancyBevelAdditive(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context, additive=True)
+        obj = basicBevel(context, context.view_layer.objects.active, additive=True)
 
         channelCutout(context, obj, is_large=False)
 
@@ -541,7 +2562,7 @@ class OP_LargeFancyBevel(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context)
+        obj = basicBevel(context, context.view_layer.objects.active)
 
         channelCutout(context, obj, is_large=True)
 
@@ -559,7 +2580,7 @@ class OP_LargeFancyBevelAdditive(bpy.types.Operator):
             self.report({"WARNING"}, "No object selected")
             return {"CANCELLED"}
 
-        obj = basicBevel(context, additive=True)
+        obj = basicBevel(context, context.view_layer.objects.active, additive=True)
 
         channelCutout(context, obj, is_large=True)
 
@@ -574,9 +2595,141 @@ class SceneProperties(bpy.types.PropertyGroup):
         maxlen=1024,
         subtype="DIR_PATH",
     )
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        description="File format for Export and Repeat Export, 3MF and PLY store each vert once and are far smaller",
+        items=[(key, label, "") for key, (label, ext, writer) in EXPORT_FORMATS.items()],
+        default='STL',
+    )
+    batch_pipeline: bpy.props.EnumProperty(
+        name="Operation",
+        description="Base operation to run on each object in the batch",
+        items=pipelineItems,
+    )
+    batch_source: bpy.props.EnumProperty(
+        name="Objects",
+        description="Which objects the batch runs on",
+        items=(
+            ('SELECTED', "Selected", "All selected mesh objects"),
+            ('COLLECTION', "Collection", "All mesh objects in a collection"),
+        ),
+        default='SELECTED',
+    )
+    batch_collection: bpy.props.PointerProperty(
+        name="Collection",
+        type=bpy.types.Collection,
+    )
+    use_preflight: bpy.props.BoolProperty(
+        name="Check Before Export",
+        description="Check every exported object for holes, non-manifold edges, an uneven bottom and thin walls",
+        default=True,
+    )
+    memory_budget: bpy.props.IntProperty(
+        name="Memory Budget (MB)",
+        description="Once Blender uses more memory than this, batches free memory after every object. "
+                    "0 for no budget",
+        default=0,
+        min=0,
+        step=256,
+    )
+    use_dedup: bpy.props.BoolProperty(
+        name="Merge Copies",
+        description="Process identical meshes once and give the copies a linked copy of the result, "
+                    "exports write one file per unique mesh plus a count of each",
+        default=False,
+    )
+    bevel_depth: bpy.props.FloatProperty(
+        name="Bevel Depth",
+        description="How far the bevel extends below the model",
+        default=BASE_BEVEL_DEPTH,
+        min=0.1,
+        soft_max=3.0,
+    )
+    bevel_shrink: bpy.props.FloatProperty(
+        name="Bevel Shrink",
+        description="How far the bottom of the bevel is pulled in from the edge",
+        default=SIMPLE_BEVEL_SHRINK_DISTANCE,
+        min=0.0,
+        soft_max=3.0,
+    )
+    preview_pipeline: bpy.props.EnumProperty(
+        name="Preview",
+        description="Bevel to preview",
+        items=previewPipelineItems,
+    )
+    use_fast_path: bpy.props.BoolProperty(
+        name="Fast Path",
+        description="Run fix bottom and bevel in a single bmesh pass instead of switching in and out of edit mode",
+        default=False,
+    )
+    use_slab: bpy.props.BoolProperty(
+        name="Bottom Slab Only",
+        description="Run bevels, channels and boolean trims on just the bottom of the model and weld the result back on, "
+                    "much faster on dense models",
+        default=False,
+    )
+    slab_height: bpy.props.FloatProperty(
+        name="Slab Height",
+        description="How much of the bottom of the model goes in the slab, when it isn't more than the bevel "
+                    "depth (or trim) the whole model is used",
+        default=5.0,
+        min=1.0,
+        soft_max=20.0,
+    )
+    use_profiling: bpy.props.BoolProperty(
+        name="Record Timings",
+        description="Record time, vert/face counts and peak memory for each step of the base operations",
+        # lives in the module rather than the file, so the helpers can check it without a context
+        get=lambda self: _profiling,
+        set=lambda self, value: setProfiling(value),
+    )
+    plate_width: bpy.props.FloatProperty(
+        name="Plate Width",
+        description="Size of the build plate along X",
+        default=129.0,
+        min=1.0,
+    )
+    plate_depth: bpy.props.FloatProperty(
+        name="Plate Depth",
+        description="Size of the build plate along Y",
+        default=80.0,
+        min=1.0,
+    )
+    plate_spacing: bpy.props.FloatProperty(
+        name="Spacing",
+        description="Gap left between the bottoms of neighbouring bases",
+        default=2.0,
+        min=0.0,
+        soft_max=10.0,
+    )
+    plate_rotate: bpy.props.BoolProperty(
+        name="Allow Turning",
+        description="Turn bases 90 degrees where that packs them tighter",
+        default=True,
+    )
+    trim_mode: bpy.props.EnumProperty(
+        name="Trim",
+        description="How the trim bottom operators cut the mesh",
+        items=(
+            ('PLANE', "Plane Cut", "Bisect the mesh at the trim height and cap the hole"),
+            ('BOOLEAN', "Boolean", "Cut with a boolean cube, slower but tolerates messier meshes"),
+        ),
+        default='PLANE',
+    )
 
 classes = (
     VIEW3D_PT_EC3D_Bases_Tools_Panel,
+    VIEW3D_PT_EC3D_Bases_Profile_Panel,
+    VIEW3D_PT_EC3D_Bases_Preflight_Panel,
+    OP_BatchProcess,
+    OP_PreviewBevel,
+    OP_PreviewApply,
+    OP_PreviewClear,
+    OP_ProfileDump,
+    OP_ProfileClear,
+    OP_Preflight,
+    OP_PackPlate,
+    OP_ExportPlate,
     OP_FixBottom,
     OP_ExportToSTL,
     OP_ExportRepeat,
@@ -597,10 +2750,23 @@ def register():
 
     bpy.types.Scene.ec3d = bpy.props.PointerProperty(type=SceneProperties)
 
+    bpy.app.handlers.depsgraph_update_post.append(invalidateAnalysisHandler)
+    bpy.app.handlers.load_post.append(clearAnalysisHandler)
+
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
+    _cutter_cache.clear()
+    _preview_cache.clear()
+    _preflight_cache.clear()
+    _preflight_results.clear()
+    if invalidateAnalysisHandler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(invalidateAnalysisHandler)
+    if clearAnalysisHandler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clearAnalysisHandler)
+    invalidateAnalysis()
+
 
 # This allows you to run the script directly from Blender's Text editor
 # to test the add-on without having to install it.
@@ -0,0 +1,184 @@
+# Headless batch runner for the EC3D base tools, for build boxes without a UI:
+#
+#   blender --background --factory-startup --python ec3d_cli.py -- \
+#       --pipeline fix_bottom,bevel_simple_additive,channel_large,export \
+#       --output out/ --timings timings.json model1.stl model2.obj army.blend
+#
+# Each mesh object runs through the steps in place, `export` writes <output>/<name>.<format>.
+# Timings go to --timings (or stdout), --profile and --results add per helper and per file breakdowns.
+import os, sys, json, time, argparse, traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+import ec3d_bases
+
+def stepFixBottom(context, obj, args):
+    ec3d_bases.fixBottom(obj)
+
+def stepBevel(context, obj, args):
+    ec3d_bases.bevelObject(context, obj)
+
+def stepBevelAdditive(context, obj, args):
+    ec3d_bases.bevelObject(context, obj, additive=True)
+
+def stepChannelSmall(context, obj, args):
+    ec3d_bases.channelCutout(context, obj, is_large=False)
+
+def stepChannelLarge(context, obj, args):
+    ec3d_bases.channelCutout(context, obj, is_large=True)
+
+def stepTrimSmall(context, obj, args):
+    ec3d_bases.trimBottom(context, obj, ec3d_bases.BOTTOM_TRIM_VALUE_SHORT)
+
+def stepTrimLarge(context, obj, args):
+    ec3d_bases.trimBottom(context, obj, ec3d_bases.BOTTOM_TRIM_VALUE_TALL)
+
+def stepExport(context, obj, args):
+    ec3d_bases.exportObjects(context, [obj], args.output, export_format=args.format)
+
+STEPS = {
+    'fix_bottom': stepFixBottom,
+    'bevel_simple': stepBevel,
+    'bevel_simple_additive': stepBevelAdditive,
+    'channel_small': stepChannelSmall,
+    'channel_large': stepChannelLarge,
+    'trim_small': stepTrimSmall,
+    'trim_large': stepTrimLarge,
+    'export': stepExport,
+}
+
+def importModel(filepath):
+    # returns the mesh objects that were added to the scene
+    existing = set(bpy.data.objects)
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".stl":
+        if "stl_import" in dir(bpy.ops.wm):
+            bpy.ops.wm.stl_import(filepath=filepath)
+        else:
+            bpy.ops.import_mesh.stl(filepath=filepath)
+    elif ext == ".obj":
+        if "obj_import" in dir(bpy.ops.wm):
+            bpy.ops.wm.obj_import(filepath=filepath)
+        else:
+            bpy.ops.import_scene.obj(filepath=filepath)
+    elif ext == ".blend":
+        with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+            data_to.objects = list(data_from.objects)
+        for obj in data_to.objects:
+            if obj is not None and obj.type == 'MESH':
+                bpy.context.scene.collection.objects.link(obj)
+    else:
+        raise ValueError("Unsupported file type: " + filepath)
+
+    return [obj for obj in bpy.data.objects if obj not in existing and obj.type == 'MESH']
+
+def clearModels():
+    # drop everything the last file brought in so memory doesn't grow over a long run
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in [m for m in bpy.data.meshes if not m.users]:
+        bpy.data.meshes.remove(mesh)
+    ec3d_bases.invalidateAnalysis()
+
+def processFile(context, filepath, steps, args):
+    result = {"input": filepath, "objects": [], "error": None}
+    start = time.perf_counter()
+    try:
+        import_start = time.perf_counter()
+        objects = importModel(filepath)
+        result["import_seconds"] = time.perf_counter() - import_start
+
+        for obj in objects:
+            entry = {"name": obj.name, "verts_in": len(obj.data.vertices), "faces_in": len(obj.data.polygons), "steps": []}
+            result["objects"].append(entry)
+            for name in steps:
+                step_start = time.perf_counter()
+                STEPS[name](context, obj, args)
+                entry["steps"].append({"step": name, "seconds": time.perf_counter() - step_start})
+            entry["verts_out"] = len(obj.data.vertices)
+            entry["faces_out"] = len(obj.data.polygons)
+            entry["seconds"] = sum(step["seconds"] for step in entry["steps"])
+    except Exception as e:
+        result["error"] = "%s: %s" % (type(e).__name__, e)
+        traceback.print_exc()
+    finally:
+        clearModels()
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(prog="ec3d_cli.py", description="Run EC3D base tool pipelines headless")
+    parser.add_argument("inputs", nargs="+", help="STL, OBJ or .blend files to process")
+    parser.add_argument("--pipeline", required=True,
+                        help="comma separated steps, from: " + ", ".join(STEPS))
+    parser.add_argument("--output", help="directory exported files are written to")
+    parser.add_argument("--format", default="STL", choices=list(ec3d_bases.EXPORT_FORMATS),
+                        help="file format the export step writes")
+    parser.add_argument("--timings", help="write timing JSON here instead of stdout")
+    parser.add_argument("--results", help="append a JSON line per finished file to this file")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="use the edit mode bevel instead of the single pass bmesh one")
+    parser.add_argument("--profile", help="record per helper stage timings and write them here, .csv or .json")
+    parser.add_argument("--slab", type=float, metavar="HEIGHT",
+                        help="only run bevels/channels/trims on the faces within HEIGHT of the bottom")
+    args = parser.parse_args(argv)
+
+    args.steps = [step.strip() for step in args.pipeline.split(",") if step.strip()]
+    unknown = [step for step in args.steps if step not in STEPS]
+    if unknown:
+        parser.error("unknown pipeline step(s): " + ", ".join(unknown))
+    if "export" in args.steps:
+        if not args.output:
+            parser.error("the export step needs --output")
+        os.makedirs(args.output, exist_ok=True)
+
+    return args
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parseArgs(argv)
+
+    ec3d_bases.register()
+    context = bpy.context
+    context.scene.ec3d.use_fast_path = not args.no_fast_path
+    if args.profile:
+        ec3d_bases.setProfiling(True)
+    if args.slab:
+        context.scene.ec3d.use_slab = True
+        context.scene.ec3d.slab_height = args.slab
+
+    start = time.perf_counter()
+    files = []
+    for filepath in args.inputs:
+        result = processFile(context, os.path.abspath(filepath), args.steps, args)
+        files.append(result)
+        if args.results:
+            with open(args.results, "a") as f:
+                f.write(json.dumps(result) + "\n")
+        print("EC3D: %s %s in %.2fs" % (filepath, "FAILED" if result["error"] else "done", result["seconds"]), file=sys.stderr)
+
+    report = {
+        "blender": bpy.app.version_string,
+        "pipeline": args.steps,
+        "files": files,
+        "failed": sum(1 for f in files if f["error"]),
+        "total_seconds": time.perf_counter() - start,
+    }
+
+    if args.profile:
+        ec3d_bases.writeProfile(args.profile)
+
+    if args.timings:
+        with open(args.timings, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report))
+
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    code = main()
+    sys.stdout.flush()
+    sys.exit(code)
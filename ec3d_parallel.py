@@ -0,0 +1,168 @@
+# Runs ec3d_cli.py across several background Blender processes at once. Blender's python is single threaded,
+# so a big batch only scales with cores when it is split across worker instances:
+#
+#   python ec3d_parallel.py --blender /path/to/blender --workers 16 \
+#       --pipeline fix_bottom,bevel_simple_additive,channel_large,export --output out/ --timings run.json *.stl
+#
+# Inputs go out in small chunks, files in a crashed chunk are retried on their own. Doesn't need bpy.
+import os, sys, json, time, argparse, tempfile, subprocess, threading
+from concurrent.futures import ThreadPoolExecutor
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ec3d_cli.py")
+
+def chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def readResults(path):
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # a worker killed mid write leaves half a line behind
+                continue
+            results[result["input"]] = result
+    return results
+
+def runChunk(args, files, scratch_dir):
+    fd, results_path = tempfile.mkstemp(suffix=".jsonl", dir=scratch_dir)
+    os.close(fd)
+
+    cmd = [args.blender, "--background", "--factory-startup", "-noaudio", "--threads", str(args.blender_threads),
+           "--python-exit-code", "1", "--python", CLI_SCRIPT, "--",
+           "--pipeline", args.pipeline, "--results", results_path]
+    if args.output:
+        cmd += ["--output", args.output]
+    if args.format:
+        cmd += ["--format", args.format]
+    if args.no_fast_path:
+        cmd.append("--no-fast-path")
+    if args.slab:
+        cmd += ["--slab", str(args.slab)]
+    cmd += files
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=args.timeout)
+        returncode = proc.returncode
+        stderr = proc.stderr.decode("utf-8", "replace")
+    except subprocess.TimeoutExpired:
+        returncode = None
+        stderr = "timed out after %ss" % args.timeout
+    elapsed = time.perf_counter() - start
+
+    results = readResults(results_path)
+    os.remove(results_path)
+
+    return {
+        "files": files,
+        "returncode": returncode,
+        "seconds": elapsed,
+        "results": results,
+        "stderr": stderr[-2000:],
+    }
+
+def runParallel(args, files):
+    # finished files are collected in `results` keyed by input path, whoever produced them
+    results = {}
+    crashes = []
+    lock = threading.Lock()
+    scratch_dir = tempfile.mkdtemp(prefix="ec3d_parallel_")
+
+    def handle(chunk, attempt, executor, futures):
+        run = runChunk(args, chunk, scratch_dir)
+        missing = [f for f in chunk if f not in run["results"]]
+        with lock:
+            results.update(run["results"])
+            if missing:
+                crashes.append({"files": missing, "returncode": run["returncode"], "attempt": attempt, "stderr": run["stderr"]})
+                print("EC3D parallel: worker exited with %s, %d file(s) unfinished" % (run["returncode"], len(missing)), file=sys.stderr)
+                if attempt < args.retries:
+                    for f in missing:
+                        futures.append(executor.submit(handle, [f], attempt + 1, executor, futures))
+                else:
+                    for f in missing:
+                        results[f] = {"input": f, "objects": [], "error": "worker crashed (exit %s)" % run["returncode"]}
+            done = len(results)
+        print("EC3D parallel: %d/%d files" % (done, len(files)), file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = []
+        with lock:
+            for chunk in chunked(files, args.chunk_size):
+                futures.append(executor.submit(handle, chunk, 0, executor, futures))
+        # retries append to the list while we wait, so keep going until it stops growing
+        i = 0
+        while True:
+            with lock:
+                if i >= len(futures):
+                    break
+                future = futures[i]
+            future.result()
+            i += 1
+
+    os.rmdir(scratch_dir)
+    return results, crashes
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(prog="ec3d_parallel.py", description="Run ec3d_cli.py over many Blender processes")
+    parser.add_argument("inputs", nargs="+", help="STL, OBJ or .blend files to process")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Blender processes to run at once")
+    parser.add_argument("--chunk-size", type=int, default=4, help="files per Blender process")
+    parser.add_argument("--retries", type=int, default=1, help="times to retry a file whose worker crashed")
+    parser.add_argument("--blender-threads", type=int, default=1, help="threads each Blender process may use")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a worker is killed")
+    parser.add_argument("--pipeline", required=True, help="comma separated steps, see ec3d_cli.py")
+    parser.add_argument("--output", help="directory exported files are written to")
+    parser.add_argument("--format", help="file format the export step writes, see ec3d_cli.py")
+    parser.add_argument("--timings", help="write the combined timing JSON here instead of stdout")
+    parser.add_argument("--no-fast-path", action="store_true")
+    parser.add_argument("--slab", type=float, metavar="HEIGHT", help="see ec3d_cli.py")
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+    args.chunk_size = max(1, args.chunk_size)
+    if args.output:
+        args.output = os.path.abspath(args.output)
+        os.makedirs(args.output, exist_ok=True)
+    return args
+
+def main(argv=None):
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+    files = [os.path.abspath(f) for f in args.inputs]
+
+    start = time.perf_counter()
+    results, crashes = runParallel(args, files)
+    elapsed = time.perf_counter() - start
+
+    ordered = [results[f] for f in files]
+    failed = sum(1 for r in ordered if r["error"])
+    report = {
+        "pipeline": args.pipeline.split(","),
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "files": ordered,
+        "failed": failed,
+        "crashes": crashes,
+        "total_seconds": elapsed,
+        "files_per_minute": len(files) / elapsed * 60 if elapsed > 0 else 0.0,
+    }
+
+    if args.timings:
+        with open(args.timings, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report))
+
+    print("EC3D parallel: %d files in %.1fs with %d workers (%.1f files/min), %d failed" % (
+        len(files), elapsed, args.workers, report["files_per_minute"], failed), file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())